@@ -2,8 +2,21 @@
 
 __author__ = "Toni Miquel Llull"
 
-from .config import Config
-from .core import AutoCommitAI
-from .providers.factory import AIProviderFactory
-
 __all__ = ["AutoCommitAI", "AIProviderFactory", "Config"]
+
+# Public names are resolved lazily so that importing a submodule (e.g. the CLI)
+# doesn't drag in GitPython, python-dotenv and the provider modules up front.
+_LAZY_EXPORTS = {
+    "AutoCommitAI": ".core",
+    "AIProviderFactory": ".providers.factory",
+    "Config": ".config",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        import importlib
+
+        module = importlib.import_module(_LAZY_EXPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
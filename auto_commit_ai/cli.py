@@ -3,18 +3,22 @@
 # ================================
 
 import argparse
+import io
+import os
+import stat
 import sys
+import traceback
 from pathlib import Path
+from typing import TYPE_CHECKING, Optional
 
-from .core import AutoCommitAI, Config
+if TYPE_CHECKING:
+    from .config import Config
+    from .core import AutoCommitAI
 
+# Separator line used by the status/history reports
+_SEP = "=" * 60
 
-def setup_parser() -> argparse.ArgumentParser:
-    """Setup and configure the argument parser."""
-    parser = argparse.ArgumentParser(
-        description="🤖 Generate commit messages automatically using AI providers",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
+_EPILOG = """
 🚀 Some examples:
   %(prog)s                           # Generate commit for staged changes
   %(prog)s --all                     # Include all files (staged + unstaged + untracked)
@@ -25,7 +29,18 @@ def setup_parser() -> argparse.ArgumentParser:
   %(prog)s --custom-prompts ./my_prompts.py  # Use custom prompts file
   %(prog)s --context "abc"           # Additional context for commit message
   %(prog)s --branch-name             # Use current branch name in commit context
-    """,
+    """
+
+# Parser built on first use by _get_parser() and reused afterwards
+_PARSER: Optional[argparse.ArgumentParser] = None
+
+
+def setup_parser() -> argparse.ArgumentParser:
+    """Setup and configure the argument parser."""
+    parser = argparse.ArgumentParser(
+        description="🤖 Generate commit messages automatically using AI providers",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=_EPILOG,
     )
 
     # Main functionality arguments
@@ -53,7 +68,7 @@ def setup_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "--repo",
         "-r",
-        type=str,
+        type=validate_repository_path,
         default=".",
         help="Path to Git repository (defaults to current directory)",
     )
@@ -81,15 +96,24 @@ def setup_parser() -> argparse.ArgumentParser:
         "--history", action="store_true", help="Show recent commit history"
     )
 
+    parser.add_argument(
+        "--show-status",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Show repository status before generating commit (default: True)",
+    )
+
+    # Kept for backwards compatibility, same as --no-show-status
     parser.add_argument(
         "--no-status",
-        action="store_true",
-        help="Don't show repository status before generating commit",
+        dest="show_status",
+        action="store_false",
+        help=argparse.SUPPRESS,
     )
 
     parser.add_argument(
         "--custom-prompts",
-        type=str,
+        type=validate_custom_prompts_path,
         help="Path to custom prompts file (Python module with prompts configuration)",
     )
 
@@ -119,38 +143,59 @@ def setup_parser() -> argparse.ArgumentParser:
     return parser
 
 
+def _get_parser() -> argparse.ArgumentParser:
+    """Return the shared argument parser, building it on first use."""
+    global _PARSER
+    if _PARSER is None:
+        _PARSER = setup_parser()
+    return _PARSER
+
+
 def validate_repository_path(repo_path: str) -> Path:
-    """Validate and return the repository path."""
-    path = Path(repo_path).resolve()
+    """
+    Validate and return the repository path.
 
-    if not path.exists():
-        raise ValueError(f"Repository path does not exist: {repo_path}")
+    The path is made absolute without resolving symlinks; call
+    ``Path.resolve()`` on the result if the real path is needed.
+    """
+    # A single stat answers both "exists?" and "is it a directory?"
+    try:
+        st = os.stat(repo_path)
+    except FileNotFoundError:
+        raise argparse.ArgumentTypeError(f"Repository path does not exist: {repo_path}")
 
-    if not path.is_dir():
-        raise ValueError(f"Repository path is not a directory: {repo_path}")
+    if not stat.S_ISDIR(st.st_mode):
+        raise argparse.ArgumentTypeError(
+            f"Repository path is not a directory: {repo_path}"
+        )
 
-    return path
+    return Path(os.path.abspath(repo_path))
 
 
 def validate_custom_prompts_path(prompts_path: str) -> Path:
     """Validate and return the custom prompts path."""
-    path = Path(prompts_path).resolve()
-
-    if not path.exists():
-        raise ValueError(f"Custom prompts file does not exist: {prompts_path}")
+    try:
+        st = os.stat(prompts_path)
+    except FileNotFoundError:
+        raise argparse.ArgumentTypeError(
+            f"Custom prompts file does not exist: {prompts_path}"
+        )
 
-    if not path.is_file():
-        raise ValueError(f"Custom prompts path is not a file: {prompts_path}")
+    if not stat.S_ISREG(st.st_mode):
+        raise argparse.ArgumentTypeError(
+            f"Custom prompts path is not a file: {prompts_path}"
+        )
 
+    path = Path(os.path.abspath(prompts_path))
     if path.suffix != ".py":
-        raise ValueError(
+        raise argparse.ArgumentTypeError(
             f"Custom prompts file must be a Python file (.py): {prompts_path}"
         )
 
     return path
 
 
-def print_repository_status(auto_commit: AutoCommitAI) -> None:
+def print_repository_status(auto_commit: "AutoCommitAI") -> None:
     """Print detailed repository status."""
     repo_info = auto_commit.get_repository_info()
 
@@ -158,58 +203,61 @@ def print_repository_status(auto_commit: AutoCommitAI) -> None:
         print(f"❌ Error on repository status: {repo_info['error']}", file=sys.stderr)
         return
 
+    # Build the whole report in memory and write it once
+    buf = io.StringIO()
     status = repo_info["status"]
-    print(f"\n{'='*60}")
-    print(f"📊 REPOSITORY STATUS - Branch: {status['current_branch']}")
-    print(f"📂 Path: {repo_info['repo_path']}")
-    print(f"{'='*60}")
+    buf.write(f"\n{_SEP}\n")
+    buf.write(f"📊 REPOSITORY STATUS - Branch: {status.current_branch}\n")
+    buf.write(f"📂 Path: {repo_info['repo_path']}\n")
+    buf.write(f"{_SEP}\n")
 
     # Files status
-    if status["staged_files"]:
-        print(f"📋 Staged files ({len(status['staged_files'])}):")
-        for file in status["staged_files"]:
-            print(f"   ✅ {file}")
+    if status.staged_files:
+        buf.write(f"📋 Staged files ({len(status.staged_files)}):\n")
+        buf.write("\n".join(f"   ✅ {file}" for file in status.staged_files))
+        buf.write("\n")
 
-    if status["unstaged_files"]:
-        print(f"📝 Modified files ({len(status['unstaged_files'])}):")
-        for file in status["unstaged_files"]:
-            print(f"   📄 {file}")
+    if status.unstaged_files:
+        buf.write(f"📝 Modified files ({len(status.unstaged_files)}):\n")
+        buf.write("\n".join(f"   📄 {file}" for file in status.unstaged_files))
+        buf.write("\n")
 
-    if status["untracked_files"]:
-        print(f"❓ Untracked files ({len(status['untracked_files'])}):")
-        for file in status["untracked_files"]:
-            print(f"   🆕 {file}")
+    if status.untracked_files:
+        buf.write(f"❓ Untracked files ({len(status.untracked_files)}):\n")
+        buf.write("\n".join(f"   🆕 {file}" for file in status.untracked_files))
+        buf.write("\n")
 
-    if not any(
-        [status["staged_files"], status["unstaged_files"], status["untracked_files"]]
-    ):
-        print("✨ Working directory clean - no changes detected")
+    if not any([status.staged_files, status.unstaged_files, status.untracked_files]):
+        buf.write("✨ Working directory clean - no changes detected\n")
 
-    print(f"{'='*60}")
+    buf.write(f"{_SEP}\n")
+    sys.stdout.write(buf.getvalue())
 
 
-def print_commit_history(auto_commit: AutoCommitAI, count: int = 5) -> None:
+def print_commit_history(auto_commit: "AutoCommitAI", count: int = 5) -> None:
     """Print recent commit history."""
     try:
         commits = auto_commit.git_utils.get_commit_history(max_count=count)
 
-        print(f"\n{'='*60}")
-        print(f"📚 RECENT COMMIT HISTORY ({len(commits)} commits)")
-        print(f"{'='*60}")
+        buf = io.StringIO()
+        buf.write(f"\n{_SEP}\n")
+        buf.write(f"📚 RECENT COMMIT HISTORY ({len(commits)} commits)\n")
+        buf.write(f"{_SEP}\n")
 
         for commit in commits:
-            print(f"🔹 {commit['hash']} - {commit['author']}")
-            print(f"   📝 {commit['message']}")
-            print(f"   🕐 {commit['date']}")
-            print()
+            buf.write(f"🔹 {commit['hash']} - {commit['author']}\n")
+            buf.write(f"   📝 {commit['message']}\n")
+            buf.write(f"   🕐 {commit['date']}\n")
+            buf.write("\n")
 
-        print(f"{'='*60}")
+        buf.write(f"{_SEP}\n")
+        sys.stdout.write(buf.getvalue())
 
     except Exception as e:
         print(f"❌ Error getting commit history: {e}", file=sys.stderr)
 
 
-def handle_preview_action(auto_commit: AutoCommitAI, args: argparse.Namespace) -> int:
+def handle_preview_action(auto_commit: "AutoCommitAI", args: argparse.Namespace) -> int:
     """Handle preview commit message action."""
     message = auto_commit.preview_commit_message(
         provider_name=args.provider,
@@ -223,14 +271,14 @@ def handle_preview_action(auto_commit: AutoCommitAI, args: argparse.Namespace) -
     return 0 if message else 1
 
 
-def handle_stage_action(auto_commit: AutoCommitAI) -> int:
+def handle_stage_action(auto_commit: "AutoCommitAI") -> int:
     """Handle interactive staging action."""
     success = auto_commit.stage_interactive()
 
     return 0 if success else 1
 
 
-def handle_commit_action(auto_commit: AutoCommitAI, args: argparse.Namespace) -> int:
+def handle_commit_action(auto_commit: "AutoCommitAI", args: argparse.Namespace) -> int:
     """Handle main commit generation action."""
     result = auto_commit.generate_and_commit(
         provider_name=args.provider,
@@ -239,37 +287,39 @@ def handle_commit_action(auto_commit: AutoCommitAI, args: argparse.Namespace) ->
         branch_name=args.branch_name,
         previous_commits=args.previous_commits,
         additional_context=args.context,
-        show_status=not args.no_status,
+        show_status=args.show_status,
     )
 
-    return 0 if result["success"] else 1
+    # A failed push leaves the commit in place but still fails the command
+    return 0 if result["success"] and not result["error"] else 1
 
 
 def create_auto_commit_instance(
-    args: argparse.Namespace, config: Config, repo_path: str
-) -> AutoCommitAI:
+    args: argparse.Namespace, config: "Config", repo_path: str
+) -> "AutoCommitAI":
     """Create AutoCommitAI instance with optional custom prompts."""
-    custom_prompts_path = None
+    from .core import AutoCommitAI
 
-    if args.custom_prompts:
-        try:
-            custom_prompts_path = validate_custom_prompts_path(args.custom_prompts)
-            if args.verbose:
-                print(f"🎯 Using custom prompts from: {custom_prompts_path}")
-        except ValueError as e:
-            raise ValueError(f"Custom prompts validation failed: {e}")
+    # Already validated by argparse (see validate_custom_prompts_path)
+    custom_prompts_path = args.custom_prompts
+
+    if custom_prompts_path and args.verbose:
+        print(f"🎯 Using custom prompts from: {custom_prompts_path}")
 
     return AutoCommitAI(config, repo_path, custom_prompts_path)
 
 
 def main():
     """Main function to handle command line arguments and execute operations."""
-    parser = setup_parser()
+    parser = _get_parser()
     args = parser.parse_args()
 
     try:
-        # Validate repository path
-        repo_path = validate_repository_path(args.repo)
+        # Already validated by argparse (see validate_repository_path)
+        repo_path = args.repo
+
+        # Deferred so that argparse errors and --help don't pay the import cost
+        from .config import Config
 
         # Load configuration
         config = Config.from_env()
@@ -306,8 +356,6 @@ def main():
 
     except Exception as e:
         if args.verbose if "args" in locals() else False:
-            import traceback
-
             traceback.print_exc()
         else:
             print(f"❌ Error in main process: {e}", file=sys.stderr)
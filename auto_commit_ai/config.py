@@ -2,7 +2,30 @@ import os
 from dataclasses import dataclass
 from typing import Optional
 
-from dotenv import load_dotenv
+# Last configuration built by Config.from_env() and the (dotenv path, mtime) it
+# was built from, so repeated calls don't re-parse an unchanged dotenv file.
+_CACHED_CONFIG: Optional["Config"] = None
+_CACHED_KEY: Optional[tuple] = None
+
+# Environment variables each provider needs to be usable: its credential (if
+# any), model and endpoint settings
+_PROVIDER_REQUIRED_VARS = {
+    "openai": ("OPENAI_API_KEY", "OPENAI_MODEL"),
+    "google": ("GOOGLE_API_KEY", "GOOGLE_MODEL"),
+    "azure": (
+        "AZURE_OPENAI_API_KEY",
+        "AZURE_OPENAI_ENDPOINT",
+        "AZURE_OPENAI_MODEL",
+        "AZURE_OPENAI_API_VERSION",
+    ),
+    "ollama": ("OLLAMA_API_URL", "OLLAMA_MODEL"),
+}
+
+
+def _configured_from_environment() -> bool:
+    """Check if the environment already sets everything the default provider needs."""
+    required_vars = _PROVIDER_REQUIRED_VARS.get(os.getenv("DEFAULT_AI_PROVIDER", ""))
+    return bool(required_vars) and all(os.getenv(var) for var in required_vars)
 
 
 @dataclass
@@ -34,18 +57,42 @@ class Config:
     default_provider: Optional[str] = None
     max_tokens: Optional[int] = None
     temperature: Optional[float] = None
+    max_diff_bytes: Optional[int] = None
+    max_input_tokens: Optional[int] = None
+
+    # Retries of failed provider requests
+    max_retries: Optional[int] = None
+    retry_base_delay: Optional[float] = None
+    retry_max_delay: Optional[float] = None
+
+    # Response cache (only used with temperature 0)
+    cache_enabled: Optional[bool] = None
+    cache_ttl: Optional[int] = None
 
     @classmethod
     def from_env(cls) -> "Config":
-        """Load configuration from environment variables."""
+        """Load configuration from environment variables.
+
+        The result is cached for the process and only rebuilt when the dotenv
+        file in use changes (different path or modification time). If the
+        environment already sets every variable the default provider needs (e.g.
+        in CI), no dotenv file is looked up at all.
+        """
+        global _CACHED_CONFIG, _CACHED_KEY
+
+        if _configured_from_environment():
+            return cls._from_environ()
+
         current_dir_dotenv = os.path.join(os.getcwd(), ".auto_commit_ai.env")
         home_dir_dotenv = os.path.join(os.path.expanduser("~"), ".auto_commit_ai.env")
 
-        if os.path.exists(current_dir_dotenv):
-            load_dotenv(dotenv_path=current_dir_dotenv, override=True)
-
-        elif os.path.exists(home_dir_dotenv):
-            load_dotenv(dotenv_path=home_dir_dotenv, override=True)
+        # One stat per candidate both checks existence and gives the mtime
+        for dotenv_path in (current_dir_dotenv, home_dir_dotenv):
+            try:
+                dotenv_mtime = os.stat(dotenv_path).st_mtime
+                break
+            except FileNotFoundError:
+                continue
         else:
             print(
                 "No .auto_commit_ai.env file found in the current or home directory. "
@@ -53,26 +100,60 @@ class Config:
             )
             exit(1)
 
+        cache_key = (dotenv_path, dotenv_mtime)
+        if _CACHED_CONFIG is not None and _CACHED_KEY == cache_key:
+            return _CACHED_CONFIG
+
+        # Only needed when a dotenv file actually has to be parsed
+        from dotenv import load_dotenv
+
+        load_dotenv(dotenv_path=dotenv_path, override=True)
+        _CACHED_CONFIG = cls._from_environ()
+        _CACHED_KEY = cache_key
+        return _CACHED_CONFIG
+
+    @classmethod
+    def invalidate_cache(cls) -> None:
+        """Forget the cached configuration so the next from_env() reloads it."""
+        global _CACHED_CONFIG, _CACHED_KEY
+        _CACHED_CONFIG = None
+        _CACHED_KEY = None
+
+    @classmethod
+    def _from_environ(cls) -> "Config":
+        """Build the configuration from the current process environment."""
+        # One snapshot instead of a separate os.getenv() lookup per setting
+        env = os.environ.copy()
         return cls(
             # OpenAI
-            openai_api_key=os.getenv("OPENAI_API_KEY"),
-            openai_model=os.getenv("OPENAI_MODEL"),
-            openai_base_url=os.getenv("OPENAI_BASE_URL"),
+            openai_api_key=env.get("OPENAI_API_KEY"),
+            openai_model=env.get("OPENAI_MODEL"),
+            openai_base_url=env.get("OPENAI_BASE_URL"),
             # Google
-            google_api_key=os.getenv("GOOGLE_API_KEY"),
-            google_model=os.getenv("GOOGLE_MODEL"),
+            google_api_key=env.get("GOOGLE_API_KEY"),
+            google_model=env.get("GOOGLE_MODEL"),
             # Azure OpenAI
-            azure_api_key=os.getenv("AZURE_OPENAI_API_KEY"),
-            azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
-            azure_model=os.getenv("AZURE_OPENAI_MODEL"),
-            azure_api_version=os.getenv("AZURE_OPENAI_API_VERSION"),
+            azure_api_key=env.get("AZURE_OPENAI_API_KEY"),
+            azure_endpoint=env.get("AZURE_OPENAI_ENDPOINT"),
+            azure_model=env.get("AZURE_OPENAI_MODEL"),
+            azure_api_version=env.get("AZURE_OPENAI_API_VERSION"),
             # Ollama
-            ollama_api_url=os.getenv("OLLAMA_API_URL"),
-            ollama_model=os.getenv("OLLAMA_MODEL"),
+            ollama_api_url=env.get("OLLAMA_API_URL"),
+            ollama_model=env.get("OLLAMA_MODEL"),
             # General
-            default_lang=os.getenv("DEFAULT_LANG", "en"),
-            custom_prompts_path=os.getenv("CUSTOM_PROMPTS_PATH"),
-            default_provider=os.getenv("DEFAULT_AI_PROVIDER"),
-            max_tokens=int(os.getenv("MAX_TOKENS", "200")),
-            temperature=float(os.getenv("TEMPERATURE", "0.3")),
+            default_lang=env.get("DEFAULT_LANG", "en"),
+            custom_prompts_path=env.get("CUSTOM_PROMPTS_PATH"),
+            default_provider=env.get("DEFAULT_AI_PROVIDER"),
+            max_tokens=int(env.get("MAX_TOKENS", "256")),
+            temperature=float(env.get("TEMPERATURE", "0")),
+            max_diff_bytes=int(env.get("MAX_DIFF_BYTES", "16384")),
+            max_input_tokens=int(env.get("MAX_INPUT_TOKENS", "3000")),
+            # Retries
+            max_retries=int(env.get("MAX_RETRIES", "2")),
+            retry_base_delay=float(env.get("RETRY_BASE_DELAY", "0.5")),
+            retry_max_delay=float(env.get("RETRY_MAX_DELAY", "30")),
+            # Cache
+            cache_enabled=env.get("CACHE_ENABLED", "false").lower()
+            in ("1", "true", "yes"),
+            cache_ttl=int(env.get("CACHE_TTL", "604800")),
         )
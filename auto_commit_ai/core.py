@@ -1,10 +1,59 @@
+import os
+import re
+import stat
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, Optional, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Collection,
+    Dict,
+    Iterator,
+    Optional,
+    Sequence,
+    Union,
+)
 
 from .config import Config
-from .git_utils import GitUtils
-from .providers.factory import AIProviderFactory
+from .git_utils import DIFF_TRUNCATION_MARKER, GitStatus, GitUtils
+
+if TYPE_CHECKING:
+    from .providers.base import AIProvider
+
+# Separator line used by the status and commit message displays
+_SEP = "=" * 60
+
+# Default answers accepted by _get_user_confirmation()
+_VALID_YES = frozenset({"y", "yes", "sí", "si"})
+_VALID_NO = frozenset({"n", "no"})
+
+# One item of an interactive staging selection: "3" or "3-5"
+_SELECTION_RANGE_RE = re.compile(r"\s*(\d+)(?:\s*-\s*(\d+))?\s*")
+
+
+def _decode_diff(data: bytes, max_bytes: Optional[int] = None) -> str:
+    """
+    Decode raw diff bytes, shortening them to roughly max_bytes first.
+
+    When the diff is too long, the first half and the last quarter of the
+    budget are kept, joined by a marker saying how much was dropped. Working on
+    the raw bytes means the dropped part is never decoded at all.
+    """
+    if not max_bytes or len(data) <= max_bytes:
+        return data.decode("utf-8", "replace")
+
+    head = data[: max_bytes // 2]
+    tail = data[-(max_bytes // 4) :]
+    dropped = len(data) - len(head) - len(tail)
+    # "ignore" drops the partial characters left at the cut points
+    return (
+        head.decode("utf-8", "ignore")
+        + DIFF_TRUNCATION_MARKER.format(dropped=dropped)
+        + tail.decode("utf-8", "ignore")
+    )
 
 
 class AutoCommitAI:
@@ -20,14 +69,25 @@ class AutoCommitAI:
         self.git_utils = GitUtils(repo_path)
         self.repo_path = repo_path
         self.custom_prompts_path = custom_prompts_path
+        self._repo_info_cache: Optional[Dict[str, Any]] = None
+        self._status_cache: Optional[GitStatus] = None
 
     def _validate_repository(self) -> None:
         """Validate that we're in a Git repository."""
-        if not self.git_utils.is_git_repo():
+        if not self.git_utils.is_git_repo(self.repo_path):
             raise Exception(f"Not in a Git repository: {self.repo_path}")
 
+    def _cached_status(self) -> GitStatus:
+        """Get the repository status, reusing it until the repository changes."""
+        if self._status_cache is None:
+            self._status_cache = self.git_utils.get_status()
+        return self._status_cache
+
     def _get_ai_provider(self, provider_name: Optional[str] = None):
         """Get the AI provider instance."""
+        # Imported here so runs that never need a provider don't load it
+        from .providers.factory import AIProviderFactory
+
         provider_name = provider_name or self.config.default_provider
         try:
             return AIProviderFactory.create_provider(
@@ -38,101 +98,140 @@ class AutoCommitAI:
 
     def _check_changes(self, include_all: bool = False) -> tuple[bool, str]:
         """Check for changes and return diff content."""
-        status = self.git_utils.get_status()
+        status = self._cached_status()
 
         if include_all:
             has_changes = (
-                status["has_staged_changes"]
-                or status["has_unstaged_changes"]
-                or status["has_untracked_files"]
+                status.has_staged_changes
+                or status.has_unstaged_changes
+                or status.has_untracked_files
             )
 
             if not has_changes:
                 return False, ""
 
-            # Get comprehensive diff including untracked files
-            diff_content = self.git_utils.get_all_diff()
-
-            # Add untracked files content if any
-            if status["untracked_files"]:
-                diff_content += self._get_untracked_files_diff(
-                    status["untracked_files"]
-                )
+            # Get comprehensive diff including untracked files. The pieces are
+            # joined once, so the (possibly large) tracked diff is copied a
+            # single time instead of once per concatenation.
+            diff_parts = [
+                self.git_utils.get_all_diff_bytes(limit=self.config.max_diff_bytes)
+            ]
+            diff_parts.extend(self._iter_untracked_files_diff(status.untracked_files))
+            diff_data = b"".join(diff_parts)
 
         else:
-            if not status["has_staged_changes"]:
+            if not status.has_staged_changes:
                 return False, ""
-            diff_content = self.git_utils.get_staged_diff()
+            diff_data = self.git_utils.get_staged_diff_bytes(
+                limit=self.config.max_diff_bytes
+            )
 
-        return bool(diff_content.strip()), diff_content
+        # Stay on raw bytes until the single decode at the end
+        if not diff_data.strip():
+            return False, ""
+        return True, _decode_diff(diff_data, self.config.max_diff_bytes)
 
-    def _get_untracked_files_diff(self, untracked_files: list) -> str:
+    def _get_untracked_files_diff(self, untracked_files: Sequence[str]) -> str:
         """Generate diff-like content for untracked files."""
-        diff_content = ""
-        for file_path in untracked_files:
-            try:
-                full_path = Path(self.repo_path) / file_path
-                if (
-                    full_path.is_file() and full_path.stat().st_size < 1024 * 1024
-                ):  # Skip files > 1MB
-                    with open(full_path, "r", encoding="utf-8", errors="ignore") as f:
-                        content = f.read()
-                    diff_content += f"\n+++ New file: {file_path}\n"
-                    for i, line in enumerate(content.splitlines(), 1):
-                        diff_content += f"+{i:4d}: {line}\n"
-            except (OSError, UnicodeDecodeError):
-                diff_content += f"\n+++ New binary/unreadable file: {file_path}\n"
-        return diff_content
+        return b"".join(self._iter_untracked_files_diff(untracked_files)).decode(
+            "utf-8", "replace"
+        )
+
+    def _iter_untracked_files_diff(
+        self, untracked_files: Sequence[str]
+    ) -> Iterator[bytes]:
+        """Yield diff-like content for untracked files, one chunk per file."""
+        # Reads block on disk I/O (releasing the GIL), so overlap them when
+        # there are enough files to pay for the thread pool
+        if len(untracked_files) <= 2:
+            yield from map(self._read_untracked_file_diff, untracked_files)
+            return
+
+        with ThreadPoolExecutor(max_workers=min(8, len(untracked_files))) as executor:
+            yield from executor.map(self._read_untracked_file_diff, untracked_files)
+
+    def _read_untracked_file_diff(self, file_path: str) -> bytes:
+        """Build the diff-like content of one untracked file (b"" if skipped)."""
+        try:
+            full_path = os.path.join(self.repo_path, file_path)
+            # One stat gives both the file type and the size
+            st = os.stat(full_path)
+            if not stat.S_ISREG(st.st_mode) or st.st_size >= 1024 * 1024:
+                return b""  # Skip directories, special files and files > 1MB
+
+            # Kept as raw bytes; the whole diff is decoded once by the caller
+            with open(full_path, "rb") as f:
+                lines = f.read().splitlines()
+            header = f"\n+++ New file: {file_path}\n".encode("utf-8")
+            if not lines:
+                return header
+            return header + b"+" + b"\n+".join(lines) + b"\n"
+        except FileNotFoundError:
+            return b""  # Removed since the status was read
+        except OSError:
+            return f"\n+++ New binary/unreadable file: {file_path}\n".encode("utf-8")
+
+    def _print_capped_files(
+        self, header: str, files: Sequence[str], cap: int = 10
+    ) -> None:
+        """Print a titled file list, showing at most `cap` files."""
+        if not files:
+            return
+        count = len(files)
+        print(f"{header} ({count}):")
+        for file in islice(files, cap):
+            print(f"   • {file}")
+        if count > cap:
+            print(f"   ... and {count - cap} more")
 
     def _display_repository_status(self) -> None:
         """Display current repository status."""
-        status = self.git_utils.get_status()
-
-        print(f"\n{'='*60}")
-        print(f"REPOSITORY STATUS - Branch: {status['current_branch']}")
-        print(f"{'='*60}")
-
-        if status["staged_files"]:
-            print(f"📋 Staged files ({len(status['staged_files'])}):")
-            for file in status["staged_files"][:10]:  # Show max 10 files
-                print(f"   • {file}")
-            if len(status["staged_files"]) > 10:
-                print(f"   ... and {len(status['staged_files']) - 10} more")
-
-        if status["unstaged_files"]:
-            print(f"📝 Modified files ({len(status['unstaged_files'])}):")
-            for file in status["unstaged_files"][:10]:
-                print(f"   • {file}")
-            if len(status["unstaged_files"]) > 10:
-                print(f"   ... and {len(status['unstaged_files']) - 10} more")
-
-        if status["untracked_files"]:
-            print(f"❓ Untracked files ({len(status['untracked_files'])}):")
-            for file in status["untracked_files"][:10]:
-                print(f"   • {file}")
-            if len(status["untracked_files"]) > 10:
-                print(f"   ... and {len(status['untracked_files']) - 10} more")
-
-        print(f"{'='*60}")
+        status = self._cached_status()
+
+        print(f"\n{_SEP}")
+        print(f"REPOSITORY STATUS - Branch: {status.current_branch}")
+        print(f"{_SEP}")
+
+        self._print_capped_files("📋 Staged files", status.staged_files)
+        self._print_capped_files("📝 Modified files", status.unstaged_files)
+        self._print_capped_files("❓ Untracked files", status.untracked_files)
+
+        print(f"{_SEP}")
+
+    def _stream_commit_message(
+        self, ai_provider: "AIProvider", *args: Optional[str]
+    ) -> Dict[str, str]:
+        """
+        Generate a commit message, showing the title as soon as it arrives.
+
+        Takes the arguments of generate_commit_message after the provider.
+        """
+        for commit_message in ai_provider.generate_commit_message_stream(*args):
+            if "description" not in commit_message:
+                print(f"📝 {commit_message['title']} ...")
+        return commit_message
 
     def _display_commit_message(self, commit_message: Dict[str, str]) -> None:
         """Display the generated commit message."""
-        print(f"\n{'='*60}")
+        print(f"\n{_SEP}")
         print("🤖 GENERATED COMMIT MESSAGE")
-        print(f"{'='*60}")
+        print(f"{_SEP}")
         print(f"📝 Title: {commit_message['title']}")
         if commit_message.get("description"):
             print(f"📄 Description:\n{commit_message['description']}")
-        print(f"{'='*60}")
+        print(f"{_SEP}")
 
     def _get_user_confirmation(
-        self, prompt: str, valid_yes: list = None, valid_no: list = None
+        self,
+        prompt: str,
+        valid_yes: Optional[Collection[str]] = None,
+        valid_no: Optional[Collection[str]] = None,
     ) -> bool:
         """Get user confirmation with customizable responses."""
         if valid_yes is None:
-            valid_yes = ["y", "yes", "sí", "si"]
+            valid_yes = _VALID_YES
         if valid_no is None:
-            valid_no = ["n", "no"]
+            valid_no = _VALID_NO
 
         while True:
             response = input(f"\n{prompt} (y/n): ").lower().strip()
@@ -144,13 +243,16 @@ class AutoCommitAI:
             else:
                 print("Please reply with 'y' to confirm or 'n' to cancel.")
 
-    def _handle_post_commit_actions(self) -> None:
-        """Handle actions after successful commit."""
+    def _handle_post_commit_actions(self) -> Optional[str]:
+        """Handle actions after successful commit; returns the push error, if any."""
+        # The history is informational only; start `git log` right away so it
+        # runs while the confirmation is printed instead of stalling the UI
+        history = self._executor.submit(self.git_utils.get_commit_history, 3)
         print("✅ Commit successful!")
 
         # Show recent commit history
         try:
-            recent_commits = self.git_utils.get_commit_history(max_count=3)
+            recent_commits = history.result(timeout=2.0)
             print("\n📚 Recent commits:")
             for commit in recent_commits:
                 print(f"   {commit['hash']} - {commit['message'][:50]}...")
@@ -161,25 +263,53 @@ class AutoCommitAI:
         if self._get_user_confirmation("🚀 Would you like to push the changes?"):
             try:
                 self.git_utils.push_changes()
+                self.invalidate_repo_info()
                 print("📡 Changes pushed successfully!")
             except Exception as e:
                 print(f"❌ Error pushing changes: {e}", file=sys.stderr)
                 print("💡 You can push manually later with: git push")
+                return str(e)
+        return None
+
+    @cached_property
+    def _executor(self) -> ThreadPoolExecutor:
+        """Background worker, created only when first needed."""
+        return ThreadPoolExecutor(max_workers=1)
+
+    def invalidate_repo_info(self) -> None:
+        """Drop cached repository information after the repository changed."""
+        self._repo_info_cache = None
+        self._status_cache = None
+        self.git_utils.invalidate_cache()
 
     def get_repository_info(self) -> Dict[str, Any]:
-        """Get comprehensive repository information."""
+        """
+        Get comprehensive repository information.
+
+        The result is cached until invalidate_repo_info() is called, which this
+        class does after staging, committing or pushing.
+        """
+        if self._repo_info_cache is not None:
+            return self._repo_info_cache
+
         try:
             self._validate_repository()
-            status = self.git_utils.get_status()
-            branches = self.git_utils.get_branches()
-            recent_commits = self.git_utils.get_commit_history(max_count=5)
-
-            return {
-                "status": status,
-                "branches": branches,
-                "recent_commits": recent_commits,
+            # The queries are independent git subprocesses, so run them
+            # concurrently and overlap their process startup cost
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                status = executor.submit(self._cached_status)
+                branches = executor.submit(self.git_utils.get_branches)
+                recent_commits = executor.submit(
+                    self.git_utils.get_commit_history, max_count=5
+                )
+
+            self._repo_info_cache = {
+                "status": status.result(),
+                "branches": branches.result(),
+                "recent_commits": recent_commits.result(),
                 "repo_path": self.repo_path,
             }
+            return self._repo_info_cache
         except Exception as e:
             return {"error": str(e)}
 
@@ -215,10 +345,7 @@ class AutoCommitAI:
             if show_status:
                 self._display_repository_status()
 
-            # Get AI provider
-            ai_provider = self._get_ai_provider(provider_name)
-
-            # Check for changes
+            # Check for changes before building the (costly) provider client
             has_changes, diff_content = self._check_changes(include_all)
 
             if not has_changes:
@@ -231,6 +358,9 @@ class AutoCommitAI:
                 result["message"] = message
                 return result
 
+            # Get AI provider
+            ai_provider = self._get_ai_provider(provider_name)
+
             # Generate commit message
             print(
                 f"🤖 Generating commit message with {ai_provider.__class__.__name__}..."
@@ -244,7 +374,8 @@ class AutoCommitAI:
                     previous_commits = self.git_utils.get_commit_history(max_count=5)
                 else:
                     previous_commits = None
-                commit_message = ai_provider.generate_commit_message(
+                commit_message = self._stream_commit_message(
+                    ai_provider,
                     diff_content,
                     language,
                     branch_name,
@@ -270,16 +401,18 @@ class AutoCommitAI:
             if include_all:
                 print("📋 Staging all changes...")
                 self.git_utils.stage_all_changes()
+                self.invalidate_repo_info()
 
             # Create commit
             try:
                 commit_hash = self.git_utils.commit_with_message(commit_message)
+                self.invalidate_repo_info()
                 result["success"] = True
                 result["commit_hash"] = commit_hash
                 result["message"] = commit_message
 
-                # Handle post-commit actions
-                self._handle_post_commit_actions()
+                # Handle post-commit actions; the commit stands if the push fails
+                result["error"] = self._handle_post_commit_actions()
 
             except Exception as e:
                 error_msg = f"Error creating commit: {e}"
@@ -311,16 +444,16 @@ class AutoCommitAI:
         try:
             self._validate_repository()
 
-            # Get AI provider
-            ai_provider = self._get_ai_provider(provider_name)
-
-            # Check for changes
+            # Check for changes before building the (costly) provider client
             has_changes, diff_content = self._check_changes(include_all)
 
             if not has_changes:
                 print("ℹ️  No changes found to generate commit message for.")
                 return None
 
+            # Get AI provider
+            ai_provider = self._get_ai_provider(provider_name)
+
             # Generate commit message
             print(
                 f"🤖 Generating commit message preview with {ai_provider.__class__.__name__}..."
@@ -333,7 +466,8 @@ class AutoCommitAI:
                 previous_commits = self.git_utils.get_commit_history(max_count=5)
             else:
                 previous_commits = None
-            commit_message = ai_provider.generate_commit_message(
+            commit_message = self._stream_commit_message(
+                ai_provider,
                 diff_content,
                 language,
                 branch_name,
@@ -353,18 +487,18 @@ class AutoCommitAI:
     def stage_interactive(self) -> bool:
         """Interactive staging of files."""
         try:
-            status = self.git_utils.get_status()
+            status = self._cached_status()
 
-            if not (status["unstaged_files"] or status["untracked_files"]):
+            if not (status.unstaged_files or status.untracked_files):
                 print("ℹ️  No unstaged files to stage.")
                 return False
 
             print("\n📝 Files available for staging:")
-            all_files = status["unstaged_files"] + status["untracked_files"]
+            all_files = status.unstaged_files + status.untracked_files
 
             for i, file in enumerate(all_files, 1):
                 file_status = (
-                    "modified" if file in status["unstaged_files"] else "untracked"
+                    "modified" if file in status.unstaged_files else "untracked"
                 )
                 print(f"  {i:2d}. {file} ({file_status})")
 
@@ -375,6 +509,7 @@ class AutoCommitAI:
 
                 if selection.lower() == "all":
                     self.git_utils.stage_files(all_files)
+                    self.invalidate_repo_info()
                     print(f"✅ Staged all {len(all_files)} files.")
                     return True
 
@@ -382,16 +517,17 @@ class AutoCommitAI:
                     # Parse selection (e.g., "1,3-5,7")
                     files_to_stage = []
                     for part in selection.split(","):
-                        part = part.strip()
-                        if "-" in part:
-                            start, end = map(int, part.split("-"))
-                            files_to_stage.extend(
-                                all_files[i - 1] for i in range(start, end + 1)
-                            )
-                        else:
-                            files_to_stage.append(all_files[int(part) - 1])
+                        match = _SELECTION_RANGE_RE.fullmatch(part)
+                        if match is None:
+                            raise ValueError(f"Invalid selection: {part}")
+                        start = int(match.group(1))
+                        end = int(match.group(2) or start)
+                        if not 1 <= start <= end <= len(all_files):
+                            raise IndexError(f"Selection out of range: {part}")
+                        files_to_stage.extend(all_files[start - 1 : end])
 
                     self.git_utils.stage_files(files_to_stage)
+                    self.invalidate_repo_info()
                     print(f"✅ Staged {len(files_to_stage)} files.")
                     return True
 
@@ -1,53 +1,302 @@
-import json
+import atexit
+import functools
 import os
-from typing import Any, Dict
-
-from git import GitCommandError, InvalidGitRepositoryError, Repo
-from git.exc import GitError
+import subprocess
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+if TYPE_CHECKING:
+    from git import Repo
+
+# Machine-readable status listing every untracked file (not just directories),
+# with a "# branch.head" header naming the current branch
+_PORCELAIN_STATUS_COMMAND = [
+    "status",
+    "--porcelain=v2",
+    "-z",
+    "--branch",
+    "--untracked-files=all",
+]
+
+# Placed where a diff capped by `limit` had its middle dropped
+DIFF_TRUNCATION_MARKER = "\n... [diff truncated {dropped} bytes] ...\n"
+
+# Pipe read size used when streaming capped git output
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+# Work tree roots already confirmed by GitUtils.is_git_repo()
+_GIT_REPO_PATHS: Set[str] = set()
+
+# Single background worker for pushes, created on first use (see push_changes_async)
+_push_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _parse_porcelain_status(output: str) -> Dict[str, Any]:
+    """Parses `git status --porcelain=v2 -z` output into file lists."""
+    staged_files = []
+    unstaged_files = []
+    untracked_files = []
+    current_branch = ""
+
+    entries = iter(output.split("\0"))
+    for entry in entries:
+        if entry.startswith("1 "):
+            # 1 <XY> <sub> <mH> <mI> <mW> <hH> <hI> <path>
+            fields = entry.split(" ", 8)
+            xy, path = fields[1], fields[8]
+        elif entry.startswith("2 "):
+            # 2 <XY> <sub> <mH> <mI> <mW> <hH> <hI> <score> <path>\0<origPath>
+            fields = entry.split(" ", 9)
+            xy, path = fields[1], fields[9]
+            next(entries, None)
+        elif entry.startswith("u "):
+            # Unmerged paths still need to be resolved in the working tree
+            unstaged_files.append(entry.split(" ", 10)[10])
+            continue
+        elif entry.startswith("? "):
+            untracked_files.append(entry[2:])
+            continue
+        elif entry.startswith("# branch.head "):
+            head = entry[len("# branch.head ") :]
+            # A detached HEAD has no branch name
+            current_branch = "" if head == "(detached)" else head
+            continue
+        else:
+            continue
+
+        # X is the index (staged) state, Y the working tree (unstaged) state
+        if xy[0] != ".":
+            staged_files.append(path)
+        if xy[1] != ".":
+            unstaged_files.append(path)
+
+    return {
+        "staged_files": staged_files,
+        "unstaged_files": unstaged_files,
+        "untracked_files": untracked_files,
+        "current_branch": current_branch,
+        "has_staged_changes": bool(staged_files),
+        "has_unstaged_changes": bool(unstaged_files),
+        "has_untracked_files": bool(untracked_files),
+    }
+
+
+class GitCommandError(Exception):
+    """Raised when a git command exits with a non-zero status."""
+
+    def __init__(self, command: Sequence[str], status: int, stderr: str = ""):
+        self.command = list(command)
+        self.status = status
+        self.stderr = stderr
+        super().__init__(
+            f"'{' '.join(self.command)}' failed with exit code {status}: "
+            f"{stderr.strip()}"
+        )
+
+
+class GitStatus(NamedTuple):
+    """Snapshot of the repository status returned by GitUtils.get_status()."""
+
+    staged_files: Tuple[str, ...]
+    unstaged_files: Tuple[str, ...]
+    untracked_files: Tuple[str, ...]
+    current_branch: str
+    is_dirty: bool
+    has_staged_changes: bool
+    has_unstaged_changes: bool
+    has_untracked_files: bool
 
 
 class GitUtils:
-    """Utilities for interacting with Git repositories using GitPython."""
+    """Utilities for interacting with Git repositories through the git CLI."""
 
     def __init__(self, repo_path: str = "."):
         """Initialize GitUtils with a repository path."""
         self.repo_path = repo_path
         self._repo = None
+        # Status and diff output are reused until the repository is changed
+        # through this instance (see invalidate_cache())
+        self._status_cache: Optional[Dict[str, Any]] = None
+        self._diff_cache: Dict[Tuple[str, ...], bytes] = {}
+        # Only branch creation and checkout change it (see _get_active_branch())
+        self._active_branch: Optional[str] = None
+        # (local, remote, current) branches; reset whenever refs may change
+        self._refs_cache: Optional[Tuple[List[str], List[str], Optional[str]]] = None
 
     @property
-    def repo(self) -> Repo:
-        """Get or create the Git repository object."""
+    def repo(self) -> "Repo":
+        """
+        Get or create the GitPython repository object.
+
+        GitUtils itself only runs the git CLI; GitPython is imported here, on
+        first access, for callers that still need the object model.
+        """
         if self._repo is None:
+            from git import InvalidGitRepositoryError, Repo
+
             try:
                 self._repo = Repo(self.repo_path)
             except InvalidGitRepositoryError:
                 raise Exception(f"Not a Git repository: {self.repo_path}")
         return self._repo
 
+    def _run_git(self, *args: str, input: Optional[bytes] = None) -> str:
+        """Runs a single git command and returns its output."""
+        return self._run_git_bytes(*args, input=input).decode("utf-8", errors="replace")
+
+    def _run_git_bytes(self, *args: str, input: Optional[bytes] = None) -> bytes:
+        """Runs a single git command and returns its raw, undecoded output."""
+        result = subprocess.run(
+            ["git", *args], cwd=self.repo_path, input=input, capture_output=True
+        )
+        if result.returncode != 0:
+            raise GitCommandError(
+                ["git", *args],
+                result.returncode,
+                result.stderr.decode(errors="replace"),
+            )
+        return result.stdout
+
+    def invalidate_cache(self) -> None:
+        """Forget cached status and diffs after the repository changed."""
+        self._status_cache = None
+        self._diff_cache.clear()
+
+    def _refresh(self) -> Dict[str, Any]:
+        """Runs `git status` once and caches the parsed result."""
+        output = self._run_git(*_PORCELAIN_STATUS_COMMAND)
+        self._status_cache = _parse_porcelain_status(output)
+        return self._status_cache
+
+    def _cached_diff(self, *args: str, limit: Optional[int] = None) -> bytes:
+        """Runs `git diff <args>` once and caches its raw output."""
+        key = (*args, str(limit))
+        diff = self._diff_cache.get(key)
+        if diff is None:
+            if limit:
+                diff = self._run_git_limited("diff", *args, limit=limit)
+            else:
+                diff = self._run_git_bytes("diff", *args)
+            self._diff_cache[key] = diff
+        return diff
+
+    def _run_git_limited(self, *args: str, limit: int) -> bytes:
+        """
+        Runs a git command, keeping roughly `limit` bytes of its output.
+
+        Output is read from the pipe in chunks; past the limit only the first
+        half and a rolling last quarter of it are held in memory, joined by
+        DIFF_TRUNCATION_MARKER. Errors go to a temporary file, so a command that
+        writes a lot of them can't block while stdout is being read.
+        """
+        command = ["git", *args]
+        head_size, tail_size = limit // 2, limit // 4
+        with (
+            tempfile.TemporaryFile() as stderr_file,
+            subprocess.Popen(
+                command, cwd=self.repo_path, stdout=subprocess.PIPE, stderr=stderr_file
+            ) as process,
+        ):
+            data = process.stdout.read(limit + 1)
+            total = len(data)
+            if total > limit:
+                head, tail = data[:head_size], data[-tail_size:]
+                for chunk in iter(
+                    functools.partial(process.stdout.read, _STREAM_CHUNK_SIZE), b""
+                ):
+                    total += len(chunk)
+                    tail = (tail + chunk)[-tail_size:]
+                dropped = total - len(head) - len(tail)
+                marker = DIFF_TRUNCATION_MARKER.format(dropped=dropped).encode("utf-8")
+                data = head + marker + tail
+            process.wait()
+            stderr_file.seek(0)
+            stderr = stderr_file.read()
+
+        if process.returncode != 0:
+            raise GitCommandError(
+                command, process.returncode, stderr.decode(errors="replace")
+            )
+        return data
+
+    def _has_diff(self, *args: str) -> bool:
+        """Runs `git diff --quiet <args>`; its exit code says if anything differs."""
+        command = ["git", "diff", "--quiet", *args]
+        result = subprocess.run(command, cwd=self.repo_path, capture_output=True)
+        if result.returncode not in (0, 1):
+            raise GitCommandError(
+                command, result.returncode, result.stderr.decode(errors="replace")
+            )
+        return result.returncode == 1
+
     @staticmethod
     def is_git_repo(path: str = ".") -> bool:
-        """Checks if the given directory is a Git repository."""
-        try:
-            Repo(path)
+        """
+        Checks if the given directory is a Git repository.
+
+        Only positive answers are remembered, so a directory becomes a
+        repository as soon as `git init` runs in it.
+        """
+        path = os.path.realpath(path)
+        if path in _GIT_REPO_PATHS:
             return True
-        except InvalidGitRepositoryError:
+        try:
+            # --show-cdup prints nothing at the top of a work tree, "../" below it
+            result = subprocess.run(
+                ["git", "rev-parse", "--show-cdup"], cwd=path, capture_output=True
+            )
+        except OSError:
             return False
+        if result.returncode != 0 or result.stdout.strip():
+            return False
+        _GIT_REPO_PATHS.add(path)
+        return True
+
+    def get_staged_diff(self, limit: Optional[int] = None) -> str:
+        """
+        Gets the diff of staged files.
 
-    def get_staged_diff(self) -> str:
-        """Gets the diff of staged files."""
+        With a limit, the diff is streamed and cut down to about that many
+        bytes (see _run_git_limited) instead of being read whole.
+        """
         try:
             # Get staged changes (index vs HEAD)
-            diff = self.repo.git.diff("--cached")
-            return diff
+            diff = self._cached_diff("--cached", limit=limit)
+            return diff.decode("utf-8", errors="replace")
         except GitCommandError as e:
             raise Exception(f"Error getting staged diff: {e}")
 
-    def get_all_diff(self) -> str:
-        """Gets the diff of all changes (staged and unstaged)."""
+    def get_all_diff(self, limit: Optional[int] = None) -> str:
+        """Gets the diff of all changes (staged and unstaged), capped like get_staged_diff."""
         try:
             # Get all changes compared to HEAD
-            diff = self.repo.git.diff("HEAD")
-            return diff
+            diff = self._cached_diff("HEAD", limit=limit)
+            return diff.decode("utf-8", errors="replace")
+        except GitCommandError as e:
+            raise Exception(f"Error getting all diff: {e}")
+
+    def get_staged_diff_bytes(self, limit: Optional[int] = None) -> bytes:
+        """Gets the diff of staged files as raw, undecoded bytes."""
+        try:
+            return self._cached_diff("--cached", limit=limit)
+        except GitCommandError as e:
+            raise Exception(f"Error getting staged diff: {e}")
+
+    def get_all_diff_bytes(self, limit: Optional[int] = None) -> bytes:
+        """Gets the diff of all changes (staged and unstaged) as raw bytes."""
+        try:
+            return self._cached_diff("HEAD", limit=limit)
         except GitCommandError as e:
             raise Exception(f"Error getting all diff: {e}")
 
@@ -55,78 +304,157 @@ class GitUtils:
         """Gets the diff of unstaged files only."""
         try:
             # Get unstaged changes (working tree vs index)
-            diff = self.repo.git.diff()
-            return diff
+            return self._run_git("diff")
         except GitCommandError as e:
             raise Exception(f"Error getting unstaged diff: {e}")
 
+    def porcelain_status(self) -> Dict[str, Any]:
+        """
+        Gets staged, unstaged and untracked files from a single `git status`.
+
+        Returns the three file lists, the current branch and the has_* flags.
+        """
+        if self._status_cache is not None:
+            return self._status_cache
+        return self._refresh()
+
+    # The has_* checks reuse a cached status when there is one; otherwise they
+    # ask git a yes/no question instead of listing every changed file
+
     def has_staged_changes(self) -> bool:
         """Checks if there are staged changes."""
         try:
-            # Check if index differs from HEAD
-            return len(list(self.repo.index.diff("HEAD"))) > 0
+            if self._status_cache is not None:
+                return self._status_cache["has_staged_changes"]
+            return self._has_diff("--cached")
         except Exception:
             return False
 
     def has_unstaged_changes(self) -> bool:
         """Checks if there are unstaged changes."""
         try:
-            # Check if working tree differs from index
-            return len(list(self.repo.index.diff(None))) > 0
+            if self._status_cache is not None:
+                return self._status_cache["has_unstaged_changes"]
+            return self._has_diff()
         except Exception:
             return False
 
     def has_untracked_files(self) -> bool:
         """Checks if there are untracked files."""
         try:
-            return len(self.repo.untracked_files) > 0
+            if self._status_cache is not None:
+                return self._status_cache["has_untracked_files"]
+            # Untracked directories are listed once instead of file by file, and
+            # only the first byte is read: any output means "yes"
+            with subprocess.Popen(
+                [
+                    "git",
+                    "ls-files",
+                    "--others",
+                    "--exclude-standard",
+                    "--directory",
+                    "--no-empty-directory",
+                    "-z",
+                ],
+                cwd=self.repo_path,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            ) as process:
+                found = bool(process.stdout.read(1))
+                # No need to let git list the rest
+                process.kill()
+            return found
         except Exception:
             return False
 
-    def get_status(self) -> Dict[str, Any]:
+    def get_status(self) -> "GitStatus":
         """Gets comprehensive repository status."""
         try:
-            return {
-                "staged_files": [item.a_path for item in self.repo.index.diff("HEAD")],
-                "unstaged_files": [item.a_path for item in self.repo.index.diff(None)],
-                "untracked_files": self.repo.untracked_files,
-                "current_branch": self.repo.active_branch.name,
-                "is_dirty": self.repo.is_dirty(),
-                "has_staged_changes": self.has_staged_changes(),
-                "has_unstaged_changes": self.has_unstaged_changes(),
-                "has_untracked_files": self.has_untracked_files(),
-            }
+            # File status and current branch both come from one `git status`
+            status = self.porcelain_status()
+
+            return GitStatus(
+                staged_files=tuple(status["staged_files"]),
+                unstaged_files=tuple(status["unstaged_files"]),
+                untracked_files=tuple(status["untracked_files"]),
+                current_branch=status["current_branch"],
+                is_dirty=status["has_staged_changes"] or status["has_unstaged_changes"],
+                has_staged_changes=status["has_staged_changes"],
+                has_unstaged_changes=status["has_unstaged_changes"],
+                has_untracked_files=status["has_untracked_files"],
+            )
         except Exception as e:
             raise Exception(f"Error getting repository status: {e}")
 
+    def _get_active_branch(self) -> str:
+        """Returns the current branch name ("" on a detached HEAD), cached."""
+        if self._active_branch is None:
+            if self._status_cache is not None:
+                self._active_branch = self._status_cache["current_branch"]
+            else:
+                self._active_branch = self._read_head()
+        return self._active_branch
+
+    def _read_head(self) -> str:
+        """Reads the current branch from .git/HEAD, without running git."""
+        head_path = os.path.join(self.repo_path, ".git", "HEAD")
+        try:
+            with open(head_path, encoding="utf-8") as f:
+                head = f.read().strip()
+        except OSError:
+            # .git is a file for worktrees and submodules; let git resolve it
+            return self._run_git("branch", "--show-current").strip()
+
+        prefix = "ref: refs/heads/"
+        return head[len(prefix) :] if head.startswith(prefix) else ""
+
     def get_branch_name(self) -> str:
         """Gets the current branch name."""
         try:
-            return self.repo.active_branch.name
+            branch = self._get_active_branch()
+            if not branch:
+                raise Exception("HEAD is detached")
+            return branch
         except Exception as e:
             raise Exception(f"Error getting current branch name: {e}")
 
     def stage_all_changes(self):
         """Adds all changes to the staging area."""
+        status = self._status_cache
+        if status is not None and not (
+            status["has_unstaged_changes"] or status["has_untracked_files"]
+        ):
+            return  # Everything is already staged, skip the worktree scan
         try:
-            # Stage all tracked files (modified and deleted)
-            self.repo.git.add("-u")
-            # Stage all untracked files
-            self.repo.git.add("-A")
+            # Stage modified, deleted and untracked files in one pass
+            self._run_git("add", "-A")
+            self.invalidate_cache()
         except GitCommandError as e:
             raise Exception(f"Error staging changes: {e}")
 
     def stage_files(self, files: list):
         """Stages specific files."""
+        if not files:
+            return
         try:
-            self.repo.index.add(files)
+            # One `git add` for any number of paths, fed NUL-separated on stdin
+            # (no ARG_MAX limit); paths are taken literally, not as globs
+            self._run_git(
+                "--literal-pathspecs",
+                "add",
+                "--pathspec-from-file=-",
+                "--pathspec-file-nul",
+                input="\0".join(files).encode("utf-8"),
+            )
+            self.invalidate_cache()
         except GitCommandError as e:
             raise Exception(f"Error staging files {files}: {e}")
 
     def unstage_files(self, files: list):
         """Unstages specific files."""
         try:
-            self.repo.git.reset("HEAD", *files)
+            self._run_git("reset", "HEAD", "--", *files)
+            self.invalidate_cache()
         except GitCommandError as e:
             raise Exception(f"Error unstaging files {files}: {e}")
 
@@ -144,9 +472,17 @@ class GitUtils:
             else:
                 commit_msg = str(message)
 
-            # Commit the changes
-            commit = self.repo.index.commit(commit_msg)
-            return commit.hexsha
+            # Commit the changes; the message goes through stdin unchanged
+            self._run_git(
+                "commit",
+                "--quiet",
+                "--cleanup=verbatim",
+                "-F",
+                "-",
+                input=commit_msg.encode("utf-8"),
+            )
+            self.invalidate_cache()
+            return self._run_git("rev-parse", "HEAD").strip()
         except GitCommandError as e:
             raise Exception(f"Error committing changes: {e}")
 
@@ -157,20 +493,12 @@ class GitUtils:
 
             # Get current branch if not specified
             if branch is None:
-                branch = self.repo.active_branch.name
-
-            # Get remote object
-            remote_obj = self.repo.remote(remote)
+                branch = self.get_branch_name()
 
-            # Push changes
-            push_info = remote_obj.push(branch)
-
-            # Check push results
-            for info in push_info:
-                if info.flags & info.ERROR:
-                    raise Exception(f"Push failed: {info.summary}")
-                elif info.flags & info.REJECTED:
-                    raise Exception(f"Push rejected: {info.summary}")
+            # Push changes; a rejected or failed push exits non-zero
+            self._run_git("push", remote, branch)
+            # The remote-tracking branch moved
+            self._refs_cache = None
 
             print("✅ Push successful!")
             return True
@@ -182,6 +510,20 @@ class GitUtils:
         except Exception as e:
             raise Exception(f"An unexpected error occurred during push: {e}")
 
+    def push_changes_async(
+        self, remote: str = "origin", branch: Optional[str] = None
+    ) -> Future:
+        """
+        Starts push_changes in the background and returns its future.
+
+        The interpreter still waits for pending pushes to finish before exiting.
+        """
+        global _push_executor
+        if _push_executor is None:
+            _push_executor = ThreadPoolExecutor(max_workers=1)
+            atexit.register(_push_executor.shutdown)
+        return _push_executor.submit(self.push_changes, remote, branch)
+
     def pull_changes(self, remote: str = "origin", branch: str = None):
         """Pulls changes from the remote repository."""
         try:
@@ -189,13 +531,12 @@ class GitUtils:
 
             # Get current branch if not specified
             if branch is None:
-                branch = self.repo.active_branch.name
-
-            # Get remote object
-            remote_obj = self.repo.remote(remote)
+                branch = self.get_branch_name()
 
             # Pull changes
-            pull_info = remote_obj.pull(branch)
+            pull_info = self._run_git("pull", remote, branch)
+            self._refs_cache = None
+            self.invalidate_cache()
 
             print("✅ Pull successful!")
             return pull_info
@@ -208,14 +549,23 @@ class GitUtils:
     def get_commit_history(self, max_count: int = 10):
         """Gets recent commit history."""
         try:
+            # Single `git log` call; fields are separated by US (0x1f) and
+            # commits by RS (0x1e) so multi-line messages split unambiguously
+            output = self._run_git(
+                "log", f"--max-count={max_count}", "--format=%H%x1f%an%x1f%aI%x1f%B%x1e"
+            )
             commits = []
-            for commit in self.repo.iter_commits(max_count=max_count):
+            for record in output.split("\x1e"):
+                record = record.strip()
+                if not record:
+                    continue
+                commit_hash, author, date, message = record.split("\x1f", 3)
                 commits.append(
                     {
-                        "hash": commit.hexsha[:8],
-                        "message": commit.message.strip(),
-                        "author": str(commit.author),
-                        "date": commit.authored_datetime.isoformat(),
+                        "hash": commit_hash[:8],
+                        "message": message.strip(),
+                        "author": author,
+                        "date": date,
                     }
                 )
             return commits
@@ -225,32 +575,64 @@ class GitUtils:
     def get_branches(self):
         """Gets all branches (local and remote)."""
         try:
-            local_branches = [branch.name for branch in self.repo.branches]
-            remote_branches = [ref.name for ref in self.repo.remote().refs]
+            if self._refs_cache is None:
+                self._refs_cache = self._refresh_refs()
+            local_branches, remote_branches, current_branch = self._refs_cache
 
             return {
-                "local": local_branches,
-                "remote": remote_branches,
-                "current": self.repo.active_branch.name,
+                "local": list(local_branches),
+                "remote": list(remote_branches),
+                "current": current_branch,
             }
         except Exception as e:
             raise Exception(f"Error getting branches: {e}")
 
+    def _refresh_refs(self) -> Tuple[List[str], List[str], Optional[str]]:
+        """Lists local, remote and current branches with one `git for-each-ref`."""
+        output = self._run_git(
+            "for-each-ref",
+            "--format=%(HEAD)%00%(refname)%00",
+            "refs/heads",
+            "refs/remotes",
+        )
+        local_branches = []
+        remote_branches = []
+        current_branch = None
+        fields = output.split("\0")
+        # Rows are "<HEAD marker>\0<refname>\0\n"; the marker is "*" or " "
+        for head, refname in zip(fields[0::2], fields[1::2]):
+            head = head.strip()
+            if refname.startswith("refs/heads/"):
+                name = refname[len("refs/heads/") :]
+                local_branches.append(name)
+                if head == "*":
+                    current_branch = name
+            elif not refname.endswith("/HEAD"):
+                remote_branches.append(refname[len("refs/remotes/") :])
+        return local_branches, remote_branches, current_branch
+
     def create_branch(self, branch_name: str, checkout: bool = True):
         """Creates a new branch."""
         try:
-            new_branch = self.repo.create_head(branch_name)
             if checkout:
-                new_branch.checkout()
-            return new_branch.name
+                self._run_git("checkout", "-b", branch_name)
+                self._active_branch = None
+                self.invalidate_cache()
+            else:
+                self._run_git("branch", branch_name)
+            self._refs_cache = None
+            return branch_name
         except Exception as e:
             raise Exception(f"Error creating branch {branch_name}: {e}")
 
     def checkout_branch(self, branch_name: str):
         """Switches to a different branch."""
         try:
-            self.repo.git.checkout(branch_name)
-            return self.repo.active_branch.name
+            self._run_git("checkout", branch_name)
+            self._active_branch = None
+            self._refs_cache = None
+            self.invalidate_cache()
+            return self.get_branch_name()
         except GitCommandError as e:
             raise Exception(f"Error checking out branch {branch_name}: {e}")
 
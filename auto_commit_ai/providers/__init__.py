@@ -2,16 +2,33 @@
 Provider module for AI services.
 """
 
-from .azure import AzureOpenAIProvider
-from .base import AIProvider
-from .factory import AIProviderFactory
-from .google import GoogleProvider
-from .openai import OpenAIProvider
-
 __all__ = [
     "AIProvider",
+    "CircuitOpenError",
     "OpenAIProvider",
     "GoogleProvider",
     "AzureOpenAIProvider",
+    "OllamaProvider",
     "AIProviderFactory",
 ]
+
+# Provider classes are resolved lazily so that importing the factory (or this
+# package) only loads the provider module that is actually used.
+_LAZY_EXPORTS = {
+    "AIProvider": ".base",
+    "CircuitOpenError": ".base",
+    "OpenAIProvider": ".openai",
+    "GoogleProvider": ".google",
+    "AzureOpenAIProvider": ".azure",
+    "OllamaProvider": ".ollama",
+    "AIProviderFactory": ".factory",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        import importlib
+
+        module = importlib.import_module(_LAZY_EXPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,71 +1,73 @@
-import json
-from typing import TYPE_CHECKING, Optional
+import contextlib
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
-from .base import AIProvider
+from .base import shared_http_client
+from .openai import OpenAIProvider
+
+# The SDK is only needed when this provider is used; the factory imports this
+# module on demand, so the check runs once per process
+try:
+    import openai
+except ImportError:
+    openai = None
 
 if TYPE_CHECKING:
     from ..config import Config
 
 
-class AzureOpenAIProvider(AIProvider):
-    """Azure OpenAI provider"""
+def _create_http_client(http2: bool):
+    # Keeps the SDK's own timeout and connection pool defaults
+    return openai.DefaultHttpxClient(http2=http2)
+
+
+class AzureOpenAIProvider(OpenAIProvider):
+    """
+    Azure OpenAI provider
+
+    Requests are those of the OpenAI provider, so parameters that the
+    deployment's API version rejects (e.g. response_format before 2023-12-01)
+    are left out the same way.
+    """
+
+    _label = "Azure OpenAI"
+    _model_setting = "azure_model"
 
     def __init__(self, config: "Config", custom_prompts_path: Optional[str] = None):
+        if openai is None:
+            raise ImportError(
+                "OpenAI library is not installed. Please install it with 'pip install openai'."
+            )
         super().__init__(config, custom_prompts_path)
-        try:
-            import openai
 
-            self.client = openai.AzureOpenAI(
+    def _create_client(self) -> Any:
+        """Get the SDK client for the configured deployment."""
+        config = self.config
+        return self._get_client(
+            (config.azure_api_key, config.azure_endpoint, config.azure_api_version),
+            lambda: openai.AzureOpenAI(
                 api_key=config.azure_api_key,
                 azure_endpoint=config.azure_endpoint,
                 api_version=config.azure_api_version,
-            )
-        except ImportError:
-            raise ImportError(
-                "OpenAI library is not installed. Please install it with 'pip install openai'."
-            )
+                http_client=shared_http_client("openai", _create_http_client),
+                # Retries (and their backoff) are handled by _retry_call
+                max_retries=0,
+            ),
+        )
+
+    def _supports_structured_outputs(self) -> bool:
+        """Structured outputs depend on the deployment's API version; JSON mode is used."""
+        return False
 
     def is_configured(self) -> bool:
         """Check if the provider is configured."""
         return bool(self.config.azure_api_key and self.config.azure_endpoint)
 
-    def generate_commit_message(
-        self,
-        diff_content: str,
-        language: Optional[str] = None,
-        branch_name: Optional[str] = None,
-        previous_commits: Optional[str] = None,
-        additional_context: Optional[str] = None,
+    def _call_llm(
+        self, system: str, user: str, max_tokens: Optional[int], schema: Dict[str, Any]
     ) -> str:
-        """Generate a commit message using Azure OpenAI."""
-        language = language or self.config.default_lang or "en"
-        prompt = self._create_base_prompt(
-            diff_content, language, branch_name, previous_commits, additional_context
-        )
-
-        max_attempts = 3
-        attemps = 0
-        while attemps < max_attempts:
-            try:
-                response = self.client.chat.completions.create(
-                    model=self.config.azure_model,
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": self.prompts.SYSTEM_PROMPT,
-                        },
-                        {"role": "user", "content": prompt},
-                    ],
-                    max_tokens=self.config.max_tokens,
-                    temperature=self.config.temperature,
-                )
-                response_content = response.choices[0].message.content.strip()
-                # Parse the response content as JSON
-                return json.loads(self._clean_markdown_json_block(response_content))
-
-            except Exception:
-                attemps += 1
-        if attemps == max_attempts:
-            raise Exception(
-                f"Error generating commit message with Azure OpenAI after {max_attempts} attempts"
-            )
+        """Send the prompts to Azure OpenAI and return the raw reply."""
+        # Stop receiving tokens once the JSON is complete
+        with contextlib.closing(
+            self._stream_llm(system, user, max_tokens, schema)
+        ) as pieces:
+            return self._read_json_stream(pieces)
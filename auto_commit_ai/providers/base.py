@@ -1,19 +1,258 @@
+import contextlib
+import functools
 import importlib.util
 import json
+import random
 import re
+import threading
+import time
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import TYPE_CHECKING, Optional, Union
+from types import ModuleType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 from . import prompts
 
+try:
+    # Faster C parser when available; same results as the json module
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
 if TYPE_CHECKING:
     from ..config import Config
+    from .cache import ResponseCache
+
+# Reply that is nothing but a ```json ... ``` (or bare ```) markdown block
+_MD_FENCED_RE = re.compile(r"\s*```(?:json)?\s*(.*?)\s*```\s*", re.DOTALL)
+# JSON object in such a block somewhere in the reply (e.g. after some prose)
+_MD_JSON_RE = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.DOTALL)
+# Complete "title" string of a (possibly unfinished) JSON reply, when it is the
+# first key of the top-level object (as in the schema and response example)
+_JSON_TITLE_RE = re.compile(
+    r'\s*(?:```(?:json)?\s*)?\{\s*"title"\s*:\s*("(?:[^"\\]|\\.)*")'
+)
+
+# JSON schema of the reply, for providers with structured outputs
+_COMMIT_MESSAGE_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "title": {"type": "string"},
+        "description": {"type": "string"},
+    },
+    "required": ["title", "description"],
+    "additionalProperties": False,
+}
+T = TypeVar("T")
+
+# Retry settings used when the Config leaves them unset
+_DEFAULT_MAX_RETRIES = 2
+_DEFAULT_RETRY_BASE_DELAY = 0.5
+_DEFAULT_RETRY_MAX_DELAY = 30.0
+
+# Placed where an oversized diff had its middle dropped before prompting
+_DIFF_TRUNCATION_MARKER = "\n... [diff truncated {dropped} characters] ...\n"
+
+# HTTP clients shared by every provider in the process, one per SDK (see
+# shared_http_client)
+_HTTP_CLIENTS: Dict[str, Any] = {}
+
+# SDK clients by (provider class, settings they were built from), see
+# AIProvider._get_client
+_SDK_CLIENTS: Dict[Tuple[Any, ...], Any] = {}
+
+# Custom prompt modules already executed, keyed by (resolved path, mtime) so an
+# edited file is loaded again
+_PROMPTS_CACHE: Dict[Tuple[str, float], ModuleType] = {}
+
+
+def shared_http_client(sdk: str, create: Callable[[bool], Any]) -> Any:
+    """
+    Get the process-wide HTTP client for an SDK, creating it on first use.
+
+    Sharing one client (and so one keep-alive connection pool) lets retries,
+    repeated calls and new provider instances skip the TCP and TLS handshakes.
+    `create` receives whether HTTP/2 can be enabled (the h2 package is present).
+    """
+    client = _HTTP_CLIENTS.get(sdk)
+    if client is None:
+        http2 = importlib.util.find_spec("h2") is not None
+        client = _HTTP_CLIENTS[sdk] = create(http2)
+    return client
+
+
+@functools.lru_cache(maxsize=None)
+def _split_template(template: str, field: str) -> Optional[Tuple[str, str]]:
+    """
+    Split a prompt template around its single {field} placeholder.
+
+    Returns None when the template has other braces (more fields or escaped
+    ones), which are left to str.format.
+    """
+    before, placeholder, after = template.partition("{" + field + "}")
+    if not placeholder or any(brace in before + after for brace in "{}"):
+        return None
+    return before, after
+
+
+def _fill_template(template: str, field: str, value: Any) -> str:
+    """Equivalent to template.format(field=value), without re-parsing the template."""
+    parts = _split_template(template, field)
+    if parts is None:
+        return template.format(**{field: value})
+    # str.format also accepts non-str values (e.g. the commit history list)
+    return parts[0] + str(value) + parts[1]
+
+
+def _check_commit_message(data: Any) -> Dict[str, str]:
+    """Check that a parsed reply is a commit message object, raising ValueError if not."""
+    if not isinstance(data, dict) or not isinstance(data.get("title"), str):
+        raise ValueError("Expected a JSON object with a commit message title")
+    return data
+
+
+class _JsonObjectScanner:
+    """Finds where top-level JSON objects (or arrays) end in text that arrives in pieces."""
+
+    def __init__(self):
+        self.text = ""
+        self._pos = 0
+        self._start = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, piece: str) -> Optional[str]:
+        """Add a piece of text; return an object's text as soon as it closes."""
+        self.text += piece
+        text = self.text
+        # Resume where the previous piece stopped, so each character is seen once
+        for i in range(self._pos, len(text)):
+            char = text[i]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                # Quotes outside an object (e.g. in prose) are not strings
+                self._in_string = self._depth > 0
+            elif char in "{[":
+                if self._depth == 0:
+                    self._start = i
+                self._depth += 1
+            elif char in "}]" and self._depth:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._pos = i + 1
+                    return text[self._start : i + 1]
+        self._pos = len(text)
+        return None
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider that keeps failing."""
+
+
+class CircuitBreaker:
+    """
+    Stops calling a provider after repeated failures, for a while.
+
+    After failure_threshold consecutive failures the circuit opens and calls
+    fail right away with CircuitOpenError. Once recovery_timeout seconds have
+    passed it is half-open: a single probe call goes through, and its outcome
+    closes the circuit again or reopens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Current state: CLOSED, OPEN or HALF_OPEN."""
+        if self._failures < self.failure_threshold:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at < self.recovery_timeout:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    def before_call(self, label: str) -> None:
+        """Raise CircuitOpenError if a call to the provider should not be made now."""
+        with self._lock:
+            state = self.state
+            if state == self.CLOSED:
+                return
+            if state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+            wait = self._opened_at + self.recovery_timeout - time.monotonic()
+            raise CircuitOpenError(
+                f"{label} failed {self._failures} times in a row; "
+                f"not calling it again for {max(wait, 0):.0f}s"
+            )
+
+    def record(self, success: Optional[bool]) -> None:
+        """
+        Record the outcome of a call.
+
+        None is for failures that say nothing about the provider's health
+        (e.g. a rejected API key or request); they leave the count as it is.
+        """
+        with self._lock:
+            self._probing = False
+            if success is None:
+                return
+            if success:
+                self._failures = 0
+                return
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                # Opens the circuit, or restarts the wait after a failed probe
+                self._opened_at = time.monotonic()
 
 
 class AIProvider(ABC):
     """Abstract base class for AI providers."""
 
+    # Provider name used in error messages
+    _label = "AI provider"
+
+    # Config field holding the provider's model name
+    _model_setting = ""
+
+    # SDK exceptions worth waiting for before retrying (e.g. connection errors)
+    # beyond those carrying a 429/5xx status; set by providers as needed
+    _retryable_errors: Tuple[type, ...] = ()
+
+    # Circuit breakers by provider label, shared by all instances of a provider
+    _circuit_breakers: Dict[str, CircuitBreaker] = {}
+
+    # (context, rendered prompt prefix) of the last prepare_context call
+    _cached_prefix: Optional[Tuple[Tuple[Optional[str], ...], str]] = None
+
     def __init__(
         self, config: "Config", custom_prompts_path: Optional[Union[str, Path]] = None
     ):
@@ -33,8 +272,12 @@ class AIProvider(ABC):
         # Convert to Path object if string
         prompts_path = Path(custom_prompts_path)
 
-        if not prompts_path.exists():
+        try:
+            cache_key = (str(prompts_path.resolve()), prompts_path.stat().st_mtime)
+        except FileNotFoundError:
             raise FileNotFoundError(f"Custom prompts file not found: {prompts_path}")
+        if cache_key in _PROMPTS_CACHE:
+            return _PROMPTS_CACHE[cache_key]
 
         # Load the custom prompts module
         spec = importlib.util.spec_from_file_location("custom_prompts", prompts_path)
@@ -45,9 +288,60 @@ class AIProvider(ABC):
         spec.loader.exec_module(custom_prompts)
 
         print(f"🔍 Loaded custom prompts from: {prompts_path}")
+        _PROMPTS_CACHE[cache_key] = custom_prompts
         return custom_prompts
 
+    @functools.cached_property
+    def _system_prompt(self) -> str:
+        """
+        System message: the instructions and response example, which never change.
+
+        Keeping all the stable text here, ahead of the per-commit user message,
+        gives every request the same prefix, which OpenAI caches server-side.
+        """
+        return self.prompts.SYSTEM_PROMPT + self.prompts.RESPONSE_JSON_EXAMPLE
+
+    @staticmethod
+    def _messages(system: str, user: str) -> List[Dict[str, str]]:
+        """Chat messages for a request, for providers with a chat messages API."""
+        return [
+            {"role": "system", "content": system},
+            {"role": "user", "content": user},
+        ]
+
+    @property
+    def model(self) -> Optional[str]:
+        """Model name configured for this provider."""
+        return getattr(self.config, self._model_setting, None)
+
     @abstractmethod
+    def _call_llm(
+        self, system: str, user: str, max_tokens: Optional[int], schema: Dict[str, Any]
+    ) -> str:
+        """
+        Send the system and user prompts to the model and return its raw reply.
+
+        `schema` is the JSON schema the reply must follow, for providers that
+        support structured outputs; the others rely on the prompt and JSON mode.
+        """
+        pass
+
+    def _stream_llm(
+        self, system: str, user: str, max_tokens: Optional[int], schema: Dict[str, Any]
+    ) -> Iterator[str]:
+        """
+        Send the prompts and yield the reply in pieces as the model writes it.
+
+        Providers whose SDK can stream override this; the default yields the
+        whole reply of _call_llm at once.
+        """
+        yield self._call_llm(system, user, max_tokens, schema)
+
+    @abstractmethod
+    def is_configured(self) -> bool:
+        """Check if the provider is configured."""
+        pass
+
     def generate_commit_message(
         self,
         diff_content: str,
@@ -55,48 +349,346 @@ class AIProvider(ABC):
         branch_name: Optional[str] = None,
         previous_commits: Optional[str] = None,
         additional_context: Optional[str] = None,
-    ) -> json:
+    ) -> Dict[str, str]:
         """Generate a commit message based on the provided diff content."""
-        pass
+        prompt = self._create_base_prompt(
+            diff_content, language, branch_name, previous_commits, additional_context
+        )
+        cache_entry = self._cache_entry(prompt)
+        if cache_entry and cache_entry[2] is not None:
+            print("💾 Using cached commit message")
+            return cache_entry[2]
 
-    @abstractmethod
-    def is_configured(self) -> bool:
-        """Check if the provider is configured."""
-        pass
+        message = self._retry_call(
+            functools.partial(self._request_commit_message, prompt), self._label
+        )
+        if cache_entry:
+            cache_entry[0].set(cache_entry[1], message)
+        return message
 
-    def _create_base_prompt(
+    def _request_commit_message(self, prompt: str) -> Dict[str, str]:
+        """Send a commit message prompt and parse the reply, without retrying."""
+        content = self._call_llm(
+            self._system_prompt,
+            prompt,
+            self.config.max_tokens,
+            _COMMIT_MESSAGE_SCHEMA,
+        )
+        return self._parse_response(content)
+
+    def generate_commit_message_stream(
         self,
         diff_content: str,
         language: Optional[str] = None,
         branch_name: Optional[str] = None,
         previous_commits: Optional[str] = None,
         additional_context: Optional[str] = None,
+    ) -> Iterator[Dict[str, str]]:
+        """
+        Generate a commit message, yielding it as soon as each part is known.
+
+        The reply is streamed: a message with only the title is yielded once the
+        title is complete, while the description is still being written, and
+        the full message last. The title is only yielded early when it is the
+        first key of the reply, as the prompt asks.
+
+        Failures are retried like in generate_commit_message. A stream that
+        fails after its title was yielded is not streamed again: the message is
+        requested without streaming, and its title may differ from the early one.
+        """
+        prompt = self._create_base_prompt(
+            diff_content, language, branch_name, previous_commits, additional_context
+        )
+        cache_entry = self._cache_entry(prompt)
+        if cache_entry and cache_entry[2] is not None:
+            print("💾 Using cached commit message")
+            yield cache_entry[2]
+            return
+
+        max_attempts = self._max_attempts()
+        for attempt in range(max_attempts):
+            title = message = None
+            self._circuit.before_call(self._label)
+            try:
+                scanner = _JsonObjectScanner()
+                with contextlib.closing(
+                    self._stream_llm(
+                        self._system_prompt,
+                        prompt,
+                        self.config.max_tokens,
+                        _COMMIT_MESSAGE_SCHEMA,
+                    )
+                ) as pieces:
+                    for piece in pieces:
+                        candidate = scanner.feed(piece)
+                        if title is None:
+                            # Anchored at the start, so each try only reads up
+                            # to the end of the title
+                            match = _JSON_TITLE_RE.match(scanner.text)
+                            if match:
+                                title = json_loads(match.group(1))
+                                yield {"title": title}
+                        if candidate is not None:
+                            with contextlib.suppress(ValueError):
+                                message = _check_commit_message(json_loads(candidate))
+                            if message is not None:
+                                # Stop receiving tokens once the object is complete
+                                break
+                if message is None:
+                    message = self._parse_response(scanner.text)
+                self._circuit.record(success=True)
+                break
+            except Exception as e:
+                self._circuit.record(success=False if self._is_transient(e) else None)
+                if title is not None:
+                    # The title was already shown; finish without streaming
+                    message = self._retry_call(
+                        functools.partial(self._request_commit_message, prompt),
+                        self._label,
+                    )
+                    break
+                if attempt + 1 == max_attempts:
+                    raise Exception(
+                        f"Error generating commit message with {self._label}: {e}"
+                    ) from e
+                if self._is_transient(e):
+                    time.sleep(self._retry_delay(e, attempt))
+
+        if cache_entry:
+            cache_entry[0].set(cache_entry[1], message)
+        yield message
+
+    def _get_client(self, settings: Tuple[Any, ...], create: Callable[[], Any]) -> Any:
+        """
+        Return the SDK client built from `settings`, creating it on first use.
+
+        Provider instances with the same credentials and endpoint share one
+        client, so constructing another provider skips the SDK setup.
+        """
+        key = (type(self), *settings)
+        client = _SDK_CLIENTS.get(key)
+        if client is None:
+            client = _SDK_CLIENTS[key] = create()
+        return client
+
+    def prepare_context(
+        self,
+        language: Optional[str] = None,
+        branch_name: Optional[str] = None,
+        previous_commits: Optional[str] = None,
+        additional_context: Optional[str] = None,
     ) -> str:
-        """Create the base prompt for generating commit messages."""
+        """
+        Render the part of the prompt that comes before the diff.
+
+        The result is kept until the context changes, so generating several
+        messages with the same context (e.g. one per diff) renders it once.
+        """
         language = language or self.config.default_lang or "en"
-        prompt = (
-            self.prompts.BASE_COMMIT_PROMPT.format(language=language)
-            + self.prompts.RESPONSE_JSON_EXAMPLE
-        )
+        key = (language, branch_name, previous_commits, additional_context)
+        if self._cached_prefix is not None and self._cached_prefix[0] == key:
+            return self._cached_prefix[1]
+
+        parts = [_fill_template(self.prompts.BASE_COMMIT_PROMPT, "language", language)]
         if branch_name:
             print("🔍 Using branch name for context")
-            prompt += self.prompts.BRANCH_NAME.format(branch_name=branch_name)
+            parts.append(
+                _fill_template(self.prompts.BRANCH_NAME, "branch_name", branch_name)
+            )
         if previous_commits:
             print("🔍 Using previous commits for context")
-            prompt += self.prompts.PREVIOUS_COMMITS.format(
-                previous_commits=previous_commits
+            parts.append(
+                _fill_template(
+                    self.prompts.PREVIOUS_COMMITS, "previous_commits", previous_commits
+                )
             )
         if additional_context:
             print("🔍 Using additional context for commit message")
-            prompt += self.prompts.ADDITIONAL_CONTEXT.format(
-                additional_context=additional_context
+            parts.append(
+                _fill_template(
+                    self.prompts.ADDITIONAL_CONTEXT,
+                    "additional_context",
+                    additional_context,
+                )
             )
-        prompt += self.prompts.CODE_CHANGES.format(diff_content=diff_content)
-        return prompt
+        prefix = "".join(parts)
+        self._cached_prefix = (key, prefix)
+        return prefix
+
+    def _create_base_prompt(
+        self,
+        diff_content: str,
+        language: Optional[str] = None,
+        branch_name: Optional[str] = None,
+        previous_commits: Optional[str] = None,
+        additional_context: Optional[str] = None,
+    ) -> str:
+        """Create the base prompt for generating commit messages."""
+        prefix = self.prepare_context(
+            language, branch_name, previous_commits, additional_context
+        )
+        diff_content = self._limit_diff(diff_content)
+        return prefix + _fill_template(
+            self.prompts.CODE_CHANGES, "diff_content", diff_content
+        )
+
+    def _cache_entry(
+        self, prompt: str
+    ) -> Optional[Tuple["ResponseCache", str, Optional[Dict[str, str]]]]:
+        """
+        Look the request up in the response cache.
+
+        Returns (cache, key, cached message or None), or None when caching is
+        off. The cache is only used when enabled and with temperature 0, where
+        the same request is expected to give the same answer.
+        """
+        if not (self.config.cache_enabled and self.config.temperature == 0):
+            return None
+
+        from .cache import ResponseCache, get_response_cache, normalize_diff
+
+        cache = get_response_cache(self.config.cache_ttl)
+        key = ResponseCache.make_key(
+            provider=self._label,
+            model=self.model,
+            system=self._system_prompt,
+            # Near-identical diffs (moved hunks, whitespace) share an entry
+            prompt=normalize_diff(prompt),
+        )
+        return cache, key, cache.get(key)
+
+    def _retry_call(self, request: Callable[[], T], provider_label: str) -> T:
+        """
+        Run a provider request, retrying it when it fails.
+
+        Rate limits, connection problems and server errors wait before the next
+        attempt; anything else (e.g. a reply that isn't valid JSON) is retried
+        right away. While the provider's circuit breaker is open, it fails
+        with CircuitOpenError without calling the provider.
+        """
+        max_attempts = self._max_attempts()
+        for attempt in range(max_attempts):
+            self._circuit.before_call(provider_label)
+            try:
+                result = request()
+            except Exception as e:
+                self._circuit.record(success=False if self._is_transient(e) else None)
+                last_error = e
+                if attempt + 1 < max_attempts and self._is_transient(e):
+                    time.sleep(self._retry_delay(e, attempt))
+            else:
+                self._circuit.record(success=True)
+                return result
+
+        raise Exception(
+            f"Error generating commit message with {provider_label} after {max_attempts} attempts"
+        ) from last_error
+
+    @property
+    def _circuit(self) -> CircuitBreaker:
+        """Circuit breaker of this provider."""
+        breaker = self._circuit_breakers.get(self._label)
+        if breaker is None:
+            breaker = self._circuit_breakers.setdefault(self._label, CircuitBreaker())
+        return breaker
+
+    def _max_attempts(self) -> int:
+        """Total attempts per request: the first one plus config.max_retries."""
+        max_retries = self.config.max_retries
+        if max_retries is None:
+            max_retries = _DEFAULT_MAX_RETRIES
+        return max_retries + 1
+
+    def _is_transient(self, error: Exception) -> bool:
+        """Check if an error is likely to go away by waiting."""
+        if isinstance(error, (ConnectionError, TimeoutError, *self._retryable_errors)):
+            return True
+        # The HTTP status is status_code (openai, ollama), code (google-genai) or
+        # response.status_code (httpx)
+        status = (
+            getattr(error, "status_code", None)
+            or getattr(error, "code", None)
+            or getattr(getattr(error, "response", None), "status_code", None)
+        )
+        return isinstance(status, int) and (status == 429 or status >= 500)
+
+    def _retry_delay(self, error: Exception, attempt: int) -> float:
+        """Seconds to wait before the next attempt, honoring a Retry-After header."""
+        base_delay = self.config.retry_base_delay
+        if base_delay is None:
+            base_delay = _DEFAULT_RETRY_BASE_DELAY
+        max_delay = self.config.retry_max_delay
+        if max_delay is None:
+            max_delay = _DEFAULT_RETRY_MAX_DELAY
+
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None)
+        if headers is not None:
+            try:
+                return min(float(headers["retry-after"]), max_delay)
+            except (KeyError, TypeError, ValueError):
+                pass
+        # Exponential backoff with jitter, so retrying clients spread out
+        delay = min(base_delay * 2**attempt, max_delay)
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def _limit_diff(self, diff_content: str) -> str:
+        """
+        Cut the diff down to max_input_tokens, or else max_diff_bytes characters.
+
+        The token budget drops the least significant hunks (see diff_compress).
+        Without one, the diff is cut like AutoCommitAI does when reading it
+        from git, which also covers callers that hand a provider a diff
+        directly, so a huge one is never copied into the prompt.
+        """
+        if self.config.max_input_tokens:
+            from .diff_compress import compress
+
+            return compress(diff_content, self.config.max_input_tokens)
+        limit = self.config.max_diff_bytes
+        if not limit or len(diff_content) <= limit:
+            return diff_content
+        # Same shape as the git-side cut: first half and last quarter
+        head = diff_content[: limit // 2]
+        tail = diff_content[-(limit // 4) :]
+        dropped = len(diff_content) - len(head) - len(tail)
+        return head + _DIFF_TRUNCATION_MARKER.format(dropped=dropped) + tail
+
+    def _read_json_stream(self, pieces: Iterable[str]) -> str:
+        """
+        Read a response streamed in pieces up to the end of its first JSON value.
+
+        Returns as soon as a complete object (or array) has arrived, so the
+        caller can close the stream instead of waiting for whatever the model
+        adds after it. Without one, the whole text is returned.
+        """
+        scanner = _JsonObjectScanner()
+        for piece in pieces:
+            candidate = scanner.feed(piece)
+            if candidate is not None:
+                try:
+                    json_loads(candidate)
+                    return candidate
+                except ValueError:
+                    pass  # Not valid JSON, keep looking for another value
+        return scanner.text
+
+    def _parse_response(self, content: str) -> Dict[str, str]:
+        """Parse the commit message JSON object out of a model reply."""
+        # Bare JSON (the usual case) needs no cleaning
+        try:
+            data = json_loads(content)
+        except ValueError:
+            data = json_loads(self._clean_markdown_json_block(content))
+        return _check_commit_message(data)
 
     def _clean_markdown_json_block(self, content: str) -> str:
         """Remove markdown code blocks and extract JSON content."""
-        match = re.search(r"```(?:json)?\s*(\{.*?\})\s*```", content, re.DOTALL)
+        # Clean JSON (the usual case) has no fence to look for
+        if "```" not in content:
+            return content.strip()
+        # The whole reply is one block: a single anchored match
+        match = _MD_FENCED_RE.fullmatch(content) or _MD_JSON_RE.search(content)
         if match:
             return match.group(1)
         return content.strip()
@@ -0,0 +1,106 @@
+import hashlib
+import json
+import os
+import re
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional, Tuple, Union
+
+DEFAULT_CACHE_DIR = Path.home() / ".auto_commit_ai" / "cache"
+
+# Parts of a diff that change without the change itself changing: hunk line
+# numbers, blob hashes and trailing whitespace
+_HUNK_RANGE_RE = re.compile(r"^@@ -\d+(?:,\d+)? \+\d+(?:,\d+)? @@", re.MULTILINE)
+_INDEX_LINE_RE = re.compile(r"^index [0-9a-f]+\.\.[0-9a-f]+.*\n", re.MULTILINE)
+_TRAILING_SPACE_RE = re.compile(r"[ \t]+$", re.MULTILINE)
+
+# Process-wide cache shared by every provider (see get_response_cache)
+_response_cache: Optional["ResponseCache"] = None
+
+
+class ResponseCache:
+    """Provider responses stored by request key, in memory and as JSON files."""
+
+    def __init__(
+        self,
+        directory: Optional[Union[str, Path]] = None,
+        ttl: Optional[float] = None,
+        max_memory_entries: int = 128,
+    ):
+        self.directory = Path(directory) if directory else DEFAULT_CACHE_DIR
+        self.ttl = ttl
+        self.max_memory_entries = max_memory_entries
+        # key -> (expiry timestamp or None, value), least recently used first
+        self._memory: "OrderedDict[str, Tuple[Optional[float], Any]]" = OrderedDict()
+
+    @staticmethod
+    def make_key(**parts: Any) -> str:
+        """Build a cache key from the parts that identify a request."""
+        payload = json.dumps(parts, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a cached value, or None if it is missing or expired."""
+        entry = self._memory.get(key)
+        if entry is None:
+            try:
+                with open(self._path(key), encoding="utf-8") as f:
+                    data = json.load(f)
+                entry = (data["expires"], data["value"])
+            except (OSError, ValueError, KeyError, TypeError):
+                return None
+
+        expires, value = entry
+        if expires is not None and expires < time.time():
+            self._memory.pop(key, None)
+            return None
+        self._remember(key, entry)
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a JSON-serializable value, expiring after ttl seconds if given."""
+        ttl = self.ttl if ttl is None else ttl
+        entry = (time.time() + ttl if ttl else None, value)
+        self._remember(key, entry)
+
+        # The disk copy is best effort; a read-only home only loses persistence
+        path = self._path(key)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            temp_path = path.with_suffix(".tmp")
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({"expires": entry[0], "value": value}, f)
+            os.replace(temp_path, path)
+        except OSError:
+            pass
+
+    def _remember(self, key: str, entry: Tuple[Optional[float], Any]) -> None:
+        """Keep an entry in memory, dropping the least recently used ones."""
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+
+def normalize_diff(text: str) -> str:
+    """
+    Remove the details of a diff that don't change its meaning.
+
+    Used for cache keys, so the same change shifted within its file (or with
+    only trailing whitespace edits) reuses the earlier response.
+    """
+    text = _HUNK_RANGE_RE.sub("@@", text)
+    text = _INDEX_LINE_RE.sub("", text)
+    return _TRAILING_SPACE_RE.sub("", text)
+
+
+def get_response_cache(ttl: Optional[float] = None) -> ResponseCache:
+    """Get the process-wide response cache, creating it on first use."""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache(ttl=ttl)
+    return _response_cache
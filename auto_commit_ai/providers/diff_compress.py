@@ -0,0 +1,62 @@
+import re
+
+# Average characters per token for code and diffs; an estimate is enough to
+# size a prompt and avoids loading a tokenizer
+CHARS_PER_TOKEN = 4
+
+# Start of each unit a diff is split into: a file header, a hunk, or an
+# untracked file added by AutoCommitAI
+_UNIT_START_RE = re.compile(r"^(?=diff --git |@@ |\+\+\+ New )", re.MULTILINE)
+
+# Units that compete for the budget; anything else (file headers) is always kept
+_RANKED_PREFIXES = ("@@ ", "+++ New ")
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in a text."""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def _score(unit: str) -> int:
+    """Number of changed lines in a hunk, or 0 if it only changes whitespace."""
+    added = []
+    removed = []
+    for line in unit.splitlines():
+        if line.startswith("+") and not line.startswith("+++"):
+            added.append(line[1:])
+        elif line.startswith("-") and not line.startswith("---"):
+            removed.append(line[1:])
+    if "".join("".join(added).split()) == "".join("".join(removed).split()):
+        return 0
+    return len(added) + len(removed)
+
+
+def compress(diff: str, budget_tokens: int) -> str:
+    """
+    Cut a diff down to about budget_tokens tokens.
+
+    File headers are always kept. Hunks are kept largest change first, as long
+    as they fit, and whitespace-only hunks are dropped; the kept ones stay in
+    their original order, followed by a note of how many were left out.
+    """
+    if budget_tokens <= 0 or estimate_tokens(diff) <= budget_tokens:
+        return diff
+
+    units = [unit for unit in _UNIT_START_RE.split(diff) if unit]
+    keep = [not unit.startswith(_RANKED_PREFIXES) for unit in units]
+    budget = budget_tokens * CHARS_PER_TOKEN
+    used = sum(len(unit) for unit, kept in zip(units, keep) if kept)
+
+    scores = {i: _score(unit) for i, unit in enumerate(units) if not keep[i]}
+    for i in sorted(scores, key=scores.get, reverse=True):
+        if scores[i] == 0:
+            break
+        if used + len(units[i]) <= budget:
+            keep[i] = True
+            used += len(units[i])
+
+    parts = [unit for unit, kept in zip(units, keep) if kept]
+    dropped = len(units) - len(parts)
+    if dropped:
+        parts.append(f"\n... {dropped} additional hunks truncated\n")
+    return "".join(parts)
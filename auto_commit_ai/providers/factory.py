@@ -1,19 +1,33 @@
+import importlib
 from pathlib import Path
-from typing import TYPE_CHECKING, Optional, Union
+from typing import TYPE_CHECKING, Dict, Optional, Tuple, Union
 
-from .azure import AzureOpenAIProvider
 from .base import AIProvider
-from .google import GoogleProvider
-from .ollama import OllamaProvider
-from .openai import OpenAIProvider
 
 if TYPE_CHECKING:
     from ..config import Config
 
 
+# Provider name -> (module, class). Each provider module is imported only when
+# that provider is requested, so unused providers (and their SDKs) never load.
+_PROVIDERS: Dict[str, Tuple[str, str]] = {
+    "openai": (".openai", "OpenAIProvider"),
+    "google": (".google", "GoogleProvider"),
+    "azure": (".azure", "AzureOpenAIProvider"),
+    "ollama": (".ollama", "OllamaProvider"),
+}
+
+
 class AIProviderFactory:
     """Factory to create AI providers."""
 
+    # Providers keep only their client and prompts, so one instance per
+    # configuration can be reused to keep its HTTP connections warm. The config
+    # is stored next to the provider so a recycled id() never matches.
+    _provider_cache: Dict[
+        Tuple[str, int, Optional[str]], Tuple["Config", AIProvider]
+    ] = {}
+
     @staticmethod
     def create_provider(
         provider_name: str,
@@ -21,32 +35,40 @@ class AIProviderFactory:
         custom_prompts_path: Optional[Union[str, Path]] = None,
     ) -> AIProvider:
         """Creaate an AI provider based on the provider name and configuration."""
-        providers = {
-            "openai": OpenAIProvider,
-            "google": GoogleProvider,
-            "azure": AzureOpenAIProvider,
-            "ollama": OllamaProvider,
-        }
-
-        if provider_name not in providers:
-            available = ", ".join(providers.keys())
+        cache_key = (
+            provider_name,
+            id(config),
+            str(custom_prompts_path) if custom_prompts_path else None,
+        )
+        cached = AIProviderFactory._provider_cache.get(cache_key)
+        if cached is not None and cached[0] is config:
+            return cached[1]
+
+        if provider_name not in _PROVIDERS:
+            available = ", ".join(_PROVIDERS)
             raise ValueError(
                 f"Provider '{provider_name}' not available. Available: {available}"
             )
 
-        provider = providers[provider_name](config, custom_prompts_path)
+        module_name, class_name = _PROVIDERS[provider_name]
+        provider_class = getattr(
+            importlib.import_module(module_name, __package__), class_name
+        )
+        provider = provider_class(config, custom_prompts_path)
 
         if not provider.is_configured():
             raise ValueError(
                 f"Provider '{provider_name}' is not configured correctly. "
                 f"Check your configuration settings."
             )
+
+        AIProviderFactory._provider_cache[cache_key] = (config, provider)
         return provider
 
     @staticmethod
     def get_available_providers() -> list[str]:
         """Returns a list of available AI providers."""
-        return ["openai", "google", "azure", "ollama"]
+        return list(_PROVIDERS)
 
     @staticmethod
     def is_provider_available(provider_name: str) -> bool:
@@ -1,65 +1,96 @@
-import json
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Optional, Tuple
 
-from .base import AIProvider
+from .base import AIProvider, shared_http_client
+
+try:
+    from google import genai
+except ImportError:
+    genai = None
 
 if TYPE_CHECKING:
     from ..config import Config
 
 
+def _create_http_client(http2: bool):
+    # httpx comes with google-genai; requests set their own timeouts
+    import httpx
+
+    return httpx.Client(
+        http2=http2,
+        limits=httpx.Limits(max_keepalive_connections=10, keepalive_expiry=60),
+    )
+
+
 class GoogleProvider(AIProvider):
     """Gooogle Gemini provider"""
 
+    _label = "Google Gemini"
+    _model_setting = "google_model"
+
     def __init__(self, config: "Config", custom_prompts_path: Optional[str] = None):
         super().__init__(config, custom_prompts_path)
-        try:
-            from google import genai
-
-            self.client = genai.Client(api_key=config.google_api_key)
-            self.model = config.google_model
-        except ImportError:
+        if genai is None:
             raise ImportError(
                 "Module 'google' is not installed. Please install it with 'pip install google-genai'."
             )
 
+        self.client = self._get_client(
+            (config.google_api_key,),
+            lambda: genai.Client(
+                api_key=config.google_api_key,
+                http_options=genai.types.HttpOptions(
+                    httpx_client=shared_http_client("google-genai", _create_http_client)
+                ),
+            ),
+        )
+        self._generation_configs: Dict[Tuple[str, Optional[int], int], Any] = {}
+
     def is_configured(self) -> bool:
         """Check if the provider is configured."""
         return bool(self.config.google_api_key)
 
-    def generate_commit_message(
-        self,
-        diff_content: str,
-        language: Optional[str] = None,
-        branch_name: Optional[str] = None,
-        previous_commits: Optional[str] = None,
-        additional_context: Optional[str] = None,
-    ) -> str:
-        """Generate a commit message using Google Gemini."""
-        language = language or self.config.default_lang or "en"
-
-        prompt = (
-            self.prompts.SYSTEM_PROMPT
-            + "\n\n"
-            + self._create_base_prompt(
-                diff_content,
-                language,
-                branch_name,
-                previous_commits,
-                additional_context,
-            )
-        )
-        max_attempts = 3
-        attemps = 0
-        while attemps < max_attempts:
-            try:
-                response = self.client.models.generate_content(
-                    model=self.model, contents=prompt
+    def _generation_config(
+        self, system: str, max_tokens: Optional[int], schema: Dict[str, Any]
+    ):
+        """
+        Request settings: the system instruction, output schema and token cap.
+
+        Built once per (system prompt, max_tokens, schema) and reused by every
+        call. Schemas are module constants, so they are told apart by identity.
+        """
+        key = (system, max_tokens, id(schema))
+        generation_config = self._generation_configs.get(key)
+        if generation_config is None:
+            generation_config = self._generation_configs[key] = (
+                genai.types.GenerateContentConfig(
+                    system_instruction=system,
+                    response_mime_type="application/json",
+                    response_json_schema=schema,
+                    max_output_tokens=max_tokens,
+                    temperature=self.config.temperature,
                 )
-                response_content = response.text.strip()
-                return json.loads(self._clean_markdown_json_block(response_content))
-            except Exception:
-                attemps += 1
-        if attemps == max_attempts:
-            raise Exception(
-                f"Error generating commit message with Google Gemini after {max_attempts} attempts"
             )
+        return generation_config
+
+    def _call_llm(
+        self, system: str, user: str, max_tokens: Optional[int], schema: Dict[str, Any]
+    ) -> str:
+        """Send the prompts to Google Gemini and return the raw reply."""
+        response = self.client.models.generate_content(
+            model=self.model,
+            contents=user,
+            config=self._generation_config(system, max_tokens, schema),
+        )
+        return response.text
+
+    def _stream_llm(
+        self, system: str, user: str, max_tokens: Optional[int], schema: Dict[str, Any]
+    ) -> Iterator[str]:
+        """Send the prompts to Google Gemini and yield the reply as it streams in."""
+        for chunk in self.client.models.generate_content_stream(
+            model=self.model,
+            contents=user,
+            config=self._generation_config(system, max_tokens, schema),
+        ):
+            if chunk.text:
+                yield chunk.text
@@ -1,8 +1,12 @@
-import json
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Optional
 
 from .base import AIProvider
 
+try:
+    from ollama import Client
+except ImportError:
+    Client = None
+
 if TYPE_CHECKING:
     from ..config import Config
 
@@ -10,58 +14,52 @@ if TYPE_CHECKING:
 class OllamaProvider(AIProvider):
     """Ollama provider"""
 
+    _label = "Ollama"
+    _model_setting = "ollama_model"
+
     def __init__(self, config: "Config", custom_prompts_path: Optional[str] = None):
         super().__init__(config, custom_prompts_path)
-        try:
-            from ollama import Client
-
-            self.client = Client(host=config.ollama_api_url)
-        except ImportError:
+        if Client is None:
             raise ImportError(
                 "Ollama library is not installed. Please install it with 'pip install ollama'."
             )
 
+        # One client per host, so its connection pool is reused across instances
+        self.client = self._get_client(
+            (config.ollama_api_url,), lambda: Client(host=config.ollama_api_url)
+        )
+
     def is_configured(self) -> bool:
         """Check if the provider is configured."""
         return bool(self.config.ollama_model)
 
-    def generate_commit_message(
-        self,
-        diff_content: str,
-        language: Optional[str] = None,
-        branch_name: Optional[str] = None,
-        previous_commits: Optional[str] = None,
-        additional_context: Optional[str] = None,
+    def _options(self, max_tokens: Optional[int]) -> Dict[str, Any]:
+        """Model options that are configured; the rest keep the model defaults."""
+        options = {"num_predict": max_tokens, "temperature": self.config.temperature}
+        return {name: value for name, value in options.items() if value is not None}
+
+    def _call_llm(
+        self, system: str, user: str, max_tokens: Optional[int], schema: Dict[str, Any]
     ) -> str:
-        """Generate a commit message using Ollama."""
-        language = language or self.config.default_lang or "en"
-        prompt = self._create_base_prompt(
-            diff_content, language, branch_name, previous_commits, additional_context
+        """Send the prompts to Ollama and return the raw reply."""
+        response = self.client.chat(
+            model=self.model,
+            messages=self._messages(system, user),
+            format="json",
+            options=self._options(max_tokens),
         )
+        return response.message.content
 
-        max_attempts = 3
-        attemps = 0
-        while attemps < max_attempts:
-            try:
-                response = self.client.chat(
-                    model=self.config.ollama_model,
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": self.prompts.SYSTEM_PROMPT,
-                        },
-                        {
-                            "role": "user",
-                            "content": prompt,
-                        },
-                    ],
-                )
-                response_content = response.message.content.strip()
-                return json.loads(self._clean_markdown_json_block(response_content))
-
-            except Exception:
-                attemps += 1
-        if attemps == max_attempts:
-            raise Exception(
-                f"Error generating commit message with Ollama after {max_attempts} attempts"
-            )
+    def _stream_llm(
+        self, system: str, user: str, max_tokens: Optional[int], schema: Dict[str, Any]
+    ) -> Iterator[str]:
+        """Send the prompts to Ollama and yield the reply as it streams in."""
+        for chunk in self.client.chat(
+            model=self.model,
+            messages=self._messages(system, user),
+            format="json",
+            options=self._options(max_tokens),
+            stream=True,
+        ):
+            if chunk.message.content:
+                yield chunk.message.content
@@ -1,66 +1,164 @@
-import json
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Optional, Set
 
-from .base import AIProvider
+from .base import AIProvider, shared_http_client
+
+try:
+    import openai
+except ImportError:
+    openai = None
 
 if TYPE_CHECKING:
     from ..config import Config
 
 
+# JSON mode: the reply is always a single JSON object
+_JSON_MODE = {"type": "json_object"}
+
+
+def _structured_output(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Structured outputs: the reply is always valid JSON following the schema."""
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": "commit_message", "schema": schema, "strict": True},
+    }
+
+
 class OpenAIProvider(AIProvider):
     """OpenAI provider"""
 
+    _label = "OpenAI"
+    _model_setting = "openai_model"
+
     def __init__(self, config: "Config", custom_prompts_path: Optional[str] = None):
         super().__init__(config, custom_prompts_path)
-        try:
-            import openai
-
-            self.client = openai.OpenAI(
-                api_key=config.openai_api_key, base_url=config.openai_base_url
-            )
-        except ImportError:
+        if openai is None:
             raise ImportError(
                 "Module 'openai' is not installed. Please install it with 'pip install openai'."
             )
 
+        self.client = self._create_client()
+        self._retryable_errors = (openai.APIConnectionError,)
+        # Request parameters the model turned down, see _request_options
+        self._rejected_options: Set[str] = set()
+
+    def _create_client(self) -> Any:
+        """Get the SDK client for the configured credentials and endpoint."""
+        config = self.config
+        return self._get_client(
+            (config.openai_api_key, config.openai_base_url),
+            lambda: openai.OpenAI(
+                api_key=config.openai_api_key,
+                base_url=config.openai_base_url,
+                # Same pool as the Azure provider, both use the openai SDK
+                http_client=shared_http_client(
+                    "openai", lambda http2: openai.DefaultHttpxClient(http2=http2)
+                ),
+                # Retries (and their backoff) are handled by _retry_call
+                max_retries=0,
+            ),
+        )
+
+    def _supports_structured_outputs(self) -> bool:
+        """Structured outputs are only requested from the OpenAI API itself."""
+        base_url = self.config.openai_base_url
+        return not base_url or "api.openai.com" in base_url
+
     def is_configured(self) -> bool:
         """Check if the provider is configured."""
         return bool(self.config.openai_api_key)
 
-    def generate_commit_message(
+    def _call_llm(
         self,
-        diff_content: str,
-        language: Optional[str] = None,
-        branch_name: Optional[str] = None,
-        previous_commits: Optional[str] = None,
-        additional_context: Optional[str] = None,
+        system: str,
+        user: str,
+        max_tokens: Optional[int],
+        schema: Dict[str, Any],
     ) -> str:
-        """Generate a commit message using OpenAI."""
-        language = language or self.config.default_lang or "en"
-        prompt = self._create_base_prompt(
-            diff_content, language, branch_name, previous_commits, additional_context
-        )
+        """Send the prompts to OpenAI and return the raw reply."""
+        response = self._create_completion(system, user, max_tokens, schema)
+        return response.choices[0].message.content
+
+    def _stream_llm(
+        self,
+        system: str,
+        user: str,
+        max_tokens: Optional[int],
+        schema: Dict[str, Any],
+    ) -> Iterator[str]:
+        """Send the prompts to OpenAI and yield the reply as it streams in."""
+        stream = self._create_completion(system, user, max_tokens, schema, stream=True)
+        try:
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            stream.close()
 
-        max_attempts = 3
-        attemps = 0
-        while attemps < max_attempts:
+    def _create_completion(
+        self,
+        system: str,
+        user: str,
+        max_tokens: Optional[int],
+        schema: Dict[str, Any],
+        **kwargs: Any,
+    ) -> Any:
+        """Create a chat completion, sending it again without any rejected parameter."""
+        messages = self._messages(system, user)
+        while True:
+            options = self._request_options(max_tokens, schema)
             try:
-                response = self.client.chat.completions.create(
-                    model=self.config.openai_model,
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": self.prompts.SYSTEM_PROMPT,
-                        },
-                        {"role": "user", "content": prompt},
-                    ],
+                return self.client.chat.completions.create(
+                    model=self.model, messages=messages, **options, **kwargs
                 )
-                response_content = response.choices[0].message.content.strip()
-                # Parse the response content as JSON
-                return json.loads(self._clean_markdown_json_block(response_content))
-            except Exception:
-                attemps += 1
-        if attemps == max_attempts:
-            raise Exception(
-                f"Error generating commit message with OpenAI after {max_attempts} attempts"
-            )
+            except openai.BadRequestError as e:
+                if not self._reject_option(e, options):
+                    raise
+
+    def _request_options(
+        self, max_tokens: Optional[int], schema: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Optional request parameters, leaving out those the model has rejected.
+
+        Reasoning models (o-series, gpt-5) reject max_tokens, which is then
+        sent as max_completion_tokens, and any temperature but their default,
+        which is then left out.
+
+        Structured outputs are only requested where supported; other endpoints
+        (OPENAI_BASE_URL, Azure) start with JSON mode. A rejected format falls
+        back to JSON mode, then to none (the prompt still asks for JSON).
+        """
+        options: Dict[str, Any] = {}
+        if (
+            self._supports_structured_outputs()
+            and "json_schema" not in self._rejected_options
+        ):
+            options["response_format"] = _structured_output(schema)
+        elif "json_object" not in self._rejected_options:
+            options["response_format"] = _JSON_MODE
+        if max_tokens is not None:
+            if "max_tokens" not in self._rejected_options:
+                options["max_tokens"] = max_tokens
+            elif "max_completion_tokens" not in self._rejected_options:
+                options["max_completion_tokens"] = max_tokens
+        temperature = self.config.temperature
+        if temperature is not None and "temperature" not in self._rejected_options:
+            options["temperature"] = temperature
+        return options
+
+    def _reject_option(self, error: Exception, options: Dict[str, Any]) -> bool:
+        """
+        Remember a parameter that a 400 response names as unsupported.
+
+        Returns whether the request can be sent again without it.
+        """
+        param = getattr(error, "param", None)
+        message = str(error)
+        for name, value in options.items():
+            if name == param or name in message:
+                if name == "response_format":
+                    # Rejects this format (json_schema or json_object) only
+                    name = value["type"]
+                self._rejected_options.add(name)
+                return True
+        return False
@@ -0,0 +1,91 @@
+import pytest
+
+from auto_commit_ai.config import Config
+from auto_commit_ai.providers import cache
+from auto_commit_ai.providers.base import AIProvider
+from auto_commit_ai.providers.cache import ResponseCache, normalize_diff
+
+DIFF = """diff --git a/app.py b/app.py
+index 1a2b3c4..5d6e7f8 100644
+--- a/app.py
++++ b/app.py
+@@ -10,2 +10,3 @@ def main():
+     run()
++    report()
+"""
+
+
+class CountingProvider(AIProvider):
+    """Provider that counts its calls to the model."""
+
+    _label = "Counting provider"
+
+    def __init__(self, config):
+        super().__init__(config)
+        self.calls = 0
+
+    def _call_llm(self, system, user, max_tokens, schema):
+        self.calls += 1
+        return '{"title": "feat: report", "description": ""}'
+
+    def is_configured(self):
+        return True
+
+
+@pytest.fixture
+def response_cache(tmp_path, monkeypatch):
+    response_cache = ResponseCache(directory=tmp_path)
+    monkeypatch.setattr(cache, "_response_cache", response_cache)
+    return response_cache
+
+
+def test_same_change_elsewhere_in_the_file_is_a_hit(response_cache):
+    provider = CountingProvider(Config(cache_enabled=True, temperature=0))
+    moved = DIFF.replace("@@ -10,2 +10,3 @@", "@@ -42,2 +42,3 @@").replace(
+        "1a2b3c4..5d6e7f8", "9a8b7c6..5d4e3f2"
+    )
+
+    first = provider.generate_commit_message(DIFF)
+    second = provider.generate_commit_message(moved + "  ")
+
+    assert normalize_diff(DIFF) == normalize_diff(moved)
+    assert second == first
+    assert provider.calls == 1
+
+
+def test_different_change_is_a_miss(response_cache):
+    provider = CountingProvider(Config(cache_enabled=True, temperature=0))
+
+    provider.generate_commit_message(DIFF)
+    provider.generate_commit_message(DIFF.replace("report()", "notify()"))
+
+    assert provider.calls == 2
+
+
+def test_cache_is_off_above_temperature_zero(response_cache):
+    provider = CountingProvider(Config(cache_enabled=True, temperature=0.3))
+
+    provider.generate_commit_message(DIFF)
+    provider.generate_commit_message(DIFF)
+
+    assert provider.calls == 2
+
+
+def test_least_recently_used_entries_leave_memory(tmp_path):
+    response_cache = ResponseCache(directory=tmp_path, max_memory_entries=2)
+    response_cache.set("a", 1)
+    response_cache.set("b", 2)
+    response_cache.get("a")
+    response_cache.set("c", 3)
+
+    assert list(response_cache._memory) == ["a", "c"]
+    # Evicted entries are still read back from disk
+    assert response_cache.get("b") == 2
+    assert ResponseCache(directory=tmp_path).get("c") == 3
+
+
+def test_expired_entries_are_misses(tmp_path):
+    response_cache = ResponseCache(directory=tmp_path)
+    response_cache.set("a", 1, ttl=-1)
+
+    assert response_cache.get("a") is None
@@ -0,0 +1,46 @@
+import pytest
+
+from auto_commit_ai.config import Config
+from auto_commit_ai.providers.base import AIProvider, CircuitBreaker, CircuitOpenError
+
+
+class AuthError(Exception):
+    status_code = 401
+
+
+class FailingProvider(AIProvider):
+    """Provider whose calls raise the errors queued in `errors`."""
+
+    _label = "Failing provider"
+
+    def __init__(self, config):
+        super().__init__(config)
+        self.errors = []
+        self.calls = 0
+
+    def _call_llm(self, system, user, max_tokens, schema):
+        self.calls += 1
+        raise self.errors.pop(0)
+
+    def is_configured(self):
+        return True
+
+
+@pytest.fixture
+def provider():
+    AIProvider._circuit_breakers.pop(FailingProvider._label, None)
+    yield FailingProvider(Config(max_retries=0))
+    AIProvider._circuit_breakers.pop(FailingProvider._label, None)
+
+
+def test_auth_error_does_not_clear_failures(provider):
+    provider.errors = [ConnectionError("down")] * 4 + [AuthError("bad key")]
+    provider.errors.append(ConnectionError("down"))
+    for _ in range(6):
+        with pytest.raises(Exception):
+            provider.generate_commit_message("diff")
+    assert provider._circuit.state == CircuitBreaker.OPEN
+
+    with pytest.raises(CircuitOpenError):
+        provider.generate_commit_message("diff")
+    assert provider.calls == 6
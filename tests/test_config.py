@@ -0,0 +1,53 @@
+import os
+
+from auto_commit_ai.config import Config
+
+
+def test_generation_defaults(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / ".auto_commit_ai.env").write_text("DEFAULT_AI_PROVIDER=openai\n")
+    # Set first so that monkeypatch restores what the dotenv file loads
+    monkeypatch.setenv("DEFAULT_AI_PROVIDER", "openai")
+    for name in ("MAX_TOKENS", "TEMPERATURE", "OPENAI_API_KEY"):
+        monkeypatch.delenv(name, raising=False)
+    Config.invalidate_cache()
+
+    config = Config.from_env()
+
+    assert config.max_tokens == 256
+    assert config.temperature == 0
+
+
+def test_dotenv_fills_in_settings_missing_from_environment(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / ".auto_commit_ai.env").write_text("OPENAI_MODEL=gpt-4o-mini\n")
+    monkeypatch.setenv("DEFAULT_AI_PROVIDER", "openai")
+    monkeypatch.setenv("OPENAI_API_KEY", "key")
+    monkeypatch.setenv("OPENAI_MODEL", "")
+    Config.invalidate_cache()
+
+    config = Config.from_env()
+
+    assert config.openai_api_key == "key"
+    assert config.openai_model == "gpt-4o-mini"
+
+
+def test_config_is_reloaded_when_the_dotenv_file_changes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    dotenv = tmp_path / ".auto_commit_ai.env"
+    dotenv.write_text("DEFAULT_AI_PROVIDER=openai\nDEFAULT_LANG=en\n")
+    monkeypatch.setenv("DEFAULT_AI_PROVIDER", "openai")
+    monkeypatch.setenv("DEFAULT_LANG", "en")
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    Config.invalidate_cache()
+
+    config = Config.from_env()
+    assert Config.from_env() is config
+
+    dotenv.write_text("DEFAULT_AI_PROVIDER=openai\nDEFAULT_LANG=es\n")
+    mtime = os.stat(dotenv).st_mtime + 10
+    os.utime(dotenv, (mtime, mtime))
+
+    reloaded = Config.from_env()
+    assert reloaded is not config
+    assert reloaded.default_lang == "es"
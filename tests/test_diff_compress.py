@@ -0,0 +1,50 @@
+from auto_commit_ai.config import Config
+from auto_commit_ai.providers.base import AIProvider
+from auto_commit_ai.providers.diff_compress import compress, estimate_tokens
+
+HEADER = "diff --git a/app.py b/app.py\n--- a/app.py\n+++ b/app.py\n"
+
+
+def _hunk(start, changed_lines):
+    lines = [f"@@ -{start},1 +{start},{changed_lines} @@\n"]
+    lines += [f"+line {start}.{i} = compute({i})\n" for i in range(changed_lines)]
+    return "".join(lines)
+
+
+def test_small_diff_is_unchanged():
+    diff = HEADER + _hunk(1, 2)
+    assert compress(diff, 1000) == diff
+
+
+def test_keeps_the_largest_hunks_within_budget():
+    small, large, medium = _hunk(1, 2), _hunk(10, 12), _hunk(40, 6)
+    whitespace = "@@ -80,1 +80,1 @@\n-x = 1\n+x  =  1\n"
+    diff = HEADER + small + large + whitespace + medium
+    budget = estimate_tokens(HEADER + large + medium) + 5
+
+    compressed = compress(diff, budget)
+
+    # The two hunks with the most changed lines fit, in their original order
+    assert compressed.startswith(HEADER + large + medium)
+    assert small not in compressed
+    assert whitespace not in compressed
+    assert compressed.endswith("... 2 additional hunks truncated\n")
+    assert estimate_tokens(compressed.rsplit("\n...", 1)[0]) <= budget
+
+
+class DummyProvider(AIProvider):
+    def _call_llm(self, system, user, max_tokens, schema):
+        raise NotImplementedError
+
+    def is_configured(self):
+        return True
+
+
+def test_token_budget_replaces_the_byte_cap():
+    diff = HEADER + "".join(_hunk(i * 100, 20) for i in range(20))
+    provider = DummyProvider(Config(max_diff_bytes=100, max_input_tokens=500))
+
+    limited = provider._limit_diff(diff)
+
+    assert limited == compress(diff, 500)
+    assert "[diff truncated" not in limited
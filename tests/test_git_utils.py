@@ -0,0 +1,103 @@
+import subprocess
+import threading
+
+import pytest
+
+from auto_commit_ai.git_utils import GitCommandError, GitUtils, _parse_porcelain_status
+
+
+def _git(repo, *args):
+    subprocess.run(["git", "-C", str(repo), *args], check=True, capture_output=True)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "config", "user.email", "t@t")
+    _git(tmp_path, "config", "user.name", "Tester")
+    return tmp_path
+
+
+def test_limited_output_with_large_stderr(repo):
+    # More than a pipe buffer of errors, then a non-zero exit
+    alias = "alias.noisy=!head -c 200000 /dev/zero | tr '\\0' x >&2; echo out; exit 3"
+    errors = []
+
+    def run():
+        try:
+            GitUtils(str(repo))._run_git_limited("-c", alias, "noisy", limit=1024)
+        except GitCommandError as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout=10)
+
+    assert not thread.is_alive()
+    assert errors[0].status == 3
+    assert len(errors[0].stderr) == 200000
+
+
+def test_is_git_repo_sees_a_new_repository(tmp_path):
+    assert not GitUtils.is_git_repo(str(tmp_path))
+
+    _git(tmp_path, "init", "-q")
+
+    assert GitUtils.is_git_repo(str(tmp_path))
+
+
+def test_parse_porcelain_status_records():
+    h = "0" * 40
+    output = "\0".join(
+        [
+            "# branch.oid " + h,
+            "# branch.head main",
+            f"1 M. N... 100644 100644 100644 {h} {h} staged file.py",
+            f"1 .M N... 100644 100644 100644 {h} {h} line\nbreak.py",
+            f"2 R. N... 100644 100644 100644 {h} {h} R100 new name.py",
+            "old name.py",
+            f"2 C. N... 100644 100644 100644 {h} {h} C75 copy.py",
+            "source.py",
+            f"u UU N... 100644 100644 100644 100644 {h} {h} {h} conflict file.py",
+            "? untracked dir/new file.txt",
+            "",
+        ]
+    )
+
+    status = _parse_porcelain_status(output)
+
+    assert status["current_branch"] == "main"
+    assert status["staged_files"] == ["staged file.py", "new name.py", "copy.py"]
+    assert status["unstaged_files"] == ["line\nbreak.py", "conflict file.py"]
+    assert status["untracked_files"] == ["untracked dir/new file.txt"]
+
+
+def test_status_of_a_real_repository(repo):
+    (repo / "old name.txt").write_text("same content\n" * 20)
+    (repo / "conflict.txt").write_text("base\n")
+    _git(repo, "add", ".")
+    _git(repo, "commit", "-q", "-m", "init")
+    branch = subprocess.run(
+        ["git", "-C", str(repo), "branch", "--show-current"],
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+
+    # A conflicting merge leaves conflict.txt unmerged
+    _git(repo, "checkout", "-q", "-b", "other")
+    (repo / "conflict.txt").write_text("other\n")
+    _git(repo, "commit", "-q", "-am", "other")
+    _git(repo, "checkout", "-q", branch)
+    (repo / "conflict.txt").write_text("main\n")
+    _git(repo, "commit", "-q", "-am", "main")
+    subprocess.run(["git", "-C", str(repo), "merge", "other"], capture_output=True)
+
+    _git(repo, "mv", "old name.txt", "new name.txt")
+    (repo / "new\nline.txt").write_text("x\n")
+
+    status = GitUtils(str(repo)).get_status()
+
+    assert status.current_branch == branch
+    assert status.staged_files == ("new name.txt",)
+    assert status.unstaged_files == ("conflict.txt",)
+    assert status.untracked_files == ("new\nline.txt",)
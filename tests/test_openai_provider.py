@@ -0,0 +1,185 @@
+import json
+
+import pytest
+
+openai = pytest.importorskip("openai")
+httpx = pytest.importorskip("httpx")
+
+from auto_commit_ai.config import Config
+from auto_commit_ai.providers.openai import OpenAIProvider
+
+
+def _completion(content):
+    return {
+        "id": "chatcmpl-1",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "o3-mini",
+        "choices": [
+            {
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": content},
+            }
+        ],
+    }
+
+
+def _provider(handler, **config):
+    provider = OpenAIProvider(
+        Config(openai_api_key="key", openai_model="o3-mini", **config)
+    )
+    provider.client = openai.OpenAI(
+        api_key="key",
+        max_retries=0,
+        http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+    )
+    return provider
+
+
+def test_rejected_parameters_are_dropped():
+    requests = []
+
+    def handler(request):
+        body = json.loads(request.content)
+        requests.append(body)
+        if "max_tokens" in body:
+            error = {
+                "message": "Unsupported parameter: 'max_tokens' is not supported "
+                "with this model. Use 'max_completion_tokens' instead.",
+                "type": "invalid_request_error",
+                "param": "max_tokens",
+                "code": "unsupported_parameter",
+            }
+            return httpx.Response(400, json={"error": error})
+        if "temperature" in body:
+            error = {
+                "message": "Unsupported value: 'temperature' does not support 0.3 "
+                "with this model. Only the default (1) value is supported.",
+                "type": "invalid_request_error",
+                "param": "temperature",
+                "code": "unsupported_value",
+            }
+            return httpx.Response(400, json={"error": error})
+        return httpx.Response(
+            200, json=_completion('{"title": "feat: x", "description": ""}')
+        )
+
+    provider = _provider(handler, max_tokens=200, temperature=0.3)
+
+    assert provider.generate_commit_message("diff")["title"] == "feat: x"
+    assert len(requests) == 3
+    assert requests[-1]["max_completion_tokens"] == 200
+    assert "temperature" not in requests[-1]
+
+    # The rejected parameters are not sent again
+    provider.generate_commit_message("diff")
+    assert len(requests) == 4
+
+
+def test_unset_parameters_are_not_sent():
+    requests = []
+
+    def handler(request):
+        requests.append(json.loads(request.content))
+        return httpx.Response(
+            200, json=_completion('{"title": "feat: x", "description": ""}')
+        )
+
+    _provider(handler).generate_commit_message("diff")
+
+    assert "max_tokens" not in requests[0]
+    assert "temperature" not in requests[0]
+
+
+def test_custom_endpoints_use_json_mode():
+    requests = []
+
+    def handler(request):
+        requests.append(json.loads(request.content))
+        return httpx.Response(
+            200, json=_completion('{"title": "feat: x", "description": ""}')
+        )
+
+    provider = _provider(handler, openai_base_url="http://localhost:8000/v1")
+    provider.generate_commit_message("diff")
+
+    assert requests[0]["response_format"] == {"type": "json_object"}
+
+
+def test_rejected_response_format_falls_back():
+    requests = []
+
+    def handler(request):
+        body = json.loads(request.content)
+        requests.append(body)
+        if "response_format" in body:
+            error = {
+                "message": "Invalid parameter: 'response_format' of type "
+                f"'{body['response_format']['type']}' is not supported with this model.",
+                "type": "invalid_request_error",
+                "param": "response_format",
+                "code": None,
+            }
+            return httpx.Response(400, json={"error": error})
+        reply = '```json\n{"title": "feat: x", "description": ""}\n```'
+        return httpx.Response(200, json=_completion(reply))
+
+    provider = _provider(handler)
+
+    assert provider.generate_commit_message("diff")["title"] == "feat: x"
+    assert [body.get("response_format", {}).get("type") for body in requests] == [
+        "json_schema",
+        "json_object",
+        None,
+    ]
+
+
+def test_azure_drops_rejected_response_format():
+    from auto_commit_ai.providers.azure import AzureOpenAIProvider
+
+    requests = []
+
+    def handler(request):
+        body = json.loads(request.content)
+        requests.append(body)
+        if "response_format" in body:
+            error = {
+                "message": "Unrecognized request argument supplied: response_format",
+                "type": "invalid_request_error",
+                "param": None,
+                "code": None,
+            }
+            return httpx.Response(400, json={"error": error})
+        # Azure replies are streamed
+        chunk = _completion(None)
+        chunk["object"] = "chat.completion.chunk"
+        chunk["choices"][0]["delta"] = {"content": '{"title": "feat: x"}'}
+        return httpx.Response(
+            200,
+            text=f"data: {json.dumps(chunk)}\n\ndata: [DONE]\n\n",
+            headers={"content-type": "text/event-stream"},
+        )
+
+    provider = AzureOpenAIProvider(
+        Config(
+            azure_api_key="key",
+            azure_endpoint="https://example.openai.azure.com",
+            azure_api_version="2023-05-15",
+            azure_model="gpt-35-turbo",
+            max_tokens=256,
+            temperature=0.0,
+        )
+    )
+    provider.client = openai.AzureOpenAI(
+        api_key="key",
+        azure_endpoint="https://example.openai.azure.com",
+        api_version="2023-05-15",
+        max_retries=0,
+        http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+    )
+
+    assert provider.generate_commit_message("diff")["title"] == "feat: x"
+    assert requests[0]["response_format"] == {"type": "json_object"}
+    assert "response_format" not in requests[1]
+    assert requests[1]["max_tokens"] == 256
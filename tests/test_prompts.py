@@ -0,0 +1,46 @@
+import subprocess
+
+import pytest
+
+from auto_commit_ai.config import Config
+from auto_commit_ai.git_utils import GitUtils
+from auto_commit_ai.providers.base import AIProvider
+
+
+class DummyProvider(AIProvider):
+    """Provider that never calls a model."""
+
+    def _call_llm(self, system, user, max_tokens, schema):
+        return '{"title": "t", "description": "d"}'
+
+    def is_configured(self):
+        return True
+
+
+def _git(repo, *args):
+    subprocess.run(["git", "-C", str(repo), *args], check=True, capture_output=True)
+
+
+def test_previous_commits_from_commit_history(tmp_path):
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "config", "user.email", "t@t")
+    _git(tmp_path, "config", "user.name", "Tester")
+    (tmp_path / "a.txt").write_text("a\n")
+    _git(tmp_path, "add", "a.txt")
+    _git(tmp_path, "commit", "-q", "-m", "feat: first commit")
+
+    previous_commits = GitUtils(str(tmp_path)).get_commit_history(max_count=5)
+    prompt = DummyProvider(Config())._create_base_prompt(
+        "diff", "en", previous_commits=previous_commits
+    )
+
+    assert "feat: first commit" in prompt
+    assert prompt.endswith("diff\n")
+
+
+@pytest.mark.parametrize(
+    "reply", ['["feat: x"]', '"feat: x"', '{"description": "no title"}']
+)
+def test_reply_that_is_not_a_commit_message_object(reply):
+    with pytest.raises(ValueError):
+        DummyProvider(Config())._parse_response(reply)
@@ -0,0 +1,66 @@
+import pytest
+
+from auto_commit_ai.config import Config
+from auto_commit_ai.providers.base import AIProvider
+
+
+class StreamingProvider(AIProvider):
+    """Provider that streams `reply` one character at a time."""
+
+    _label = "Streaming provider"
+
+    def __init__(self, reply, fail_after=None):
+        super().__init__(Config(max_retries=1, retry_base_delay=0))
+        self.reply = reply
+        self.fail_after = fail_after
+        self.calls = 0
+
+    def _call_llm(self, system, user, max_tokens, schema):
+        self.calls += 1
+        return '{"title": "feat: retried", "description": "d"}'
+
+    def _stream_llm(self, system, user, max_tokens, schema):
+        for i, char in enumerate(self.reply):
+            if i == self.fail_after:
+                raise ConnectionError("connection reset")
+            yield char
+
+    def is_configured(self):
+        return True
+
+
+@pytest.fixture(autouse=True)
+def circuit_breaker():
+    AIProvider._circuit_breakers.pop(StreamingProvider._label, None)
+    yield
+    AIProvider._circuit_breakers.pop(StreamingProvider._label, None)
+
+
+def test_title_is_yielded_before_the_description():
+    reply = '{"title": "feat: add \\"x\\"", "description": "Longer text."}'
+    messages = list(StreamingProvider(reply).generate_commit_message_stream("diff"))
+
+    assert messages == [
+        {"title": 'feat: add "x"'},
+        {"title": 'feat: add "x"', "description": "Longer text."},
+    ]
+
+
+def test_nested_title_is_not_yielded():
+    reply = '{"scope": {"title": "nested"}, "title": "feat: x", "description": ""}'
+    messages = list(StreamingProvider(reply).generate_commit_message_stream("diff"))
+
+    assert messages == [
+        {"scope": {"title": "nested"}, "title": "feat: x", "description": ""}
+    ]
+
+
+def test_failure_after_title_falls_back_to_a_regular_request():
+    reply = '{"title": "feat: x", "description": "Longer text."}'
+    provider = StreamingProvider(reply, fail_after=len(reply) - 5)
+
+    messages = list(provider.generate_commit_message_stream("diff"))
+
+    assert messages[0] == {"title": "feat: x"}
+    assert messages[-1] == {"title": "feat: retried", "description": "d"}
+    assert provider.calls == 1